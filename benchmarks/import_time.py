@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+""" Measures the time it takes to import :mod:`cerberus_collections` with
+    ``python -X importtime`` and lists the most expensive imports.
+
+    Run from the project's root with ``python -m benchmarks.import_time``.
+"""
+
+from argparse import ArgumentParser
+from os import path
+from statistics import median
+from subprocess import PIPE, run
+import sys
+
+PROJECT_ROOT = path.abspath(path.join(path.dirname(__file__), '..'))
+
+
+def measure(statement):
+    """ Returns a mapping of imported modules to their cumulative import time
+        in microseconds. """
+    process = run([sys.executable, '-X', 'importtime', '-c', statement],
+                  cwd=PROJECT_ROOT, stderr=PIPE, check=True, universal_newlines=True)
+    result = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            result[module.strip()] = int(cumulative)
+    return result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--statement', default='import cerberus_collections')
+    args = parser.parse_args()
+
+    runs = [measure(args.statement) for _ in range(args.repeat)]
+    modules = set.intersection(*(set(x) for x in runs))
+    medians = {x: median(y[x] for y in runs) for x in modules}
+
+    print(args.statement)
+    for module in sorted(medians, key=medians.get, reverse=True)[:args.top]:
+        print('{:>10.0f} µs  {}'.format(medians[module], module))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+""" Compares the framing of json-encoded errors received in chunks from a
+    socket with :func:`extract_mapping_from_json_chunk` and
+    :class:`JSONMappingScanner`.
+
+    Run from the project's root with ``python -m benchmarks.json_framing``.
+"""
+
+from argparse import ArgumentParser
+from os import path
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), '..')))
+from cerberus_collections import JSONErrorHandler, Validator  # noqa: E402
+from cerberus_collections.error_handlers.json import \
+    JSONMappingScanner, extract_mapping_from_json_chunk  # noqa: E402
+
+
+def make_dump(size):
+    """ Returns a json dump of one group error with child errors that is at
+        least ``size`` bytes large. """
+    item = 'x' * 64
+    validator = Validator({'a_list': {'type': 'list', 'schema': {'type': 'integer'}}},
+                          error_handler=(JSONErrorHandler, {'indent': None}))
+    count = 1024
+    while True:
+        validator({'a_list': [item] * count})
+        dump = validator.errors.encode()
+        if len(dump) >= size:
+            return dump
+        count = count * size // len(dump) + 1
+
+
+def frame_with_rescans(dump, chunk_size):
+    buffer, result = '', []
+    for i in range(0, len(dump), chunk_size):
+        buffer += dump[i:i + chunk_size].decode()
+        if buffer.startswith('['):
+            buffer = buffer[1:]
+        mapping, buffer = extract_mapping_from_json_chunk(buffer)
+        if mapping is not None:
+            result.append(mapping)
+    return result
+
+
+def frame_with_scanner(dump, chunk_size):
+    scanner, result = JSONMappingScanner(), []
+    for i in range(0, len(dump), chunk_size):
+        result.extend(scanner.feed(dump[i:i + chunk_size]))
+    return result
+
+
+def measure(function, *args):
+    start = default_timer()
+    result = function(*args)
+    return default_timer() - start, result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=2 ** 20,
+                        help='Minimal size of the encoded error in bytes.')
+    parser.add_argument('--chunk-size', type=int, default=1024,
+                        help='Size of the received chunks in bytes.')
+    args = parser.parse_args()
+
+    dump = make_dump(args.size)
+    print('error size: {} bytes, chunk size: {} bytes'.format(len(dump), args.chunk_size))
+
+    rescans_time, rescans_result = measure(frame_with_rescans, dump, args.chunk_size)
+    scanner_time, scanner_result = measure(frame_with_scanner, dump, args.chunk_size)
+    assert len(rescans_result) == len(scanner_result) == 1
+    assert rescans_result[0].encode() == scanner_result[0]
+
+    print('extract_mapping_from_json_chunk: {:.3f}s'.format(rescans_time))
+    print('JSONMappingScanner:              {:.3f}s'.format(scanner_time))
+
+
+if __name__ == '__main__':
+    main()
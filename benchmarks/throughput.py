@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+
+""" Measures the throughput and peak memory usage of the error handlers'
+    serialization, parsing and streaming with synthetic errors at several
+    scales and stores the results to compare them across commits.
+
+    Run from the project's root with ``python -m benchmarks.throughput``. Each
+    run appends its results with the current commit to ``--output``, pass
+    ``--compare`` with a revision to print the ratios to the latest results
+    that were stored for it::
+
+        python -m benchmarks.throughput --scales 10 10000 1000000
+        git checkout some-branch
+        python -m benchmarks.throughput --compare master
+
+    Memory is measured with :mod:`tracemalloc` in a second pass, so it doesn't
+    affect the timings. Mind that large binary values at high scales need
+    plenty of memory.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime
+from io import BytesIO
+import json
+from os import path
+import platform
+from socket import socketpair
+import subprocess
+import sys
+from threading import Thread
+from timeit import default_timer
+import tracemalloc
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), '..')))
+from cerberus import errors  # noqa: E402
+from cerberus.errors import ErrorList, ValidationError  # noqa: E402
+from lxml.etree import tostring  # noqa: E402
+
+from cerberus_collections import \
+    BinaryErrorHandler, JSONErrorHandler, XMLErrorHandler  # noqa: E402
+
+
+project_root = path.abspath(path.join(path.dirname(__file__), '..'))
+
+
+# error factories
+
+def flat_errors(count, args):
+    """ Type errors of items in a list. """
+    return [ValidationError(('a_list', i), ('a_list', 'schema', 'type'), errors.BAD_TYPE.code,
+                            'type', 'integer', 'x' * 16, ()) for i in range(count)]
+
+
+def deep_errors(count, args):
+    """ Group errors that are nested ``--depth`` levels deep. """
+    result = []
+    for i in range(count):
+        document_path = ('a_list', i) + ('a_list', 0) * args.depth
+        schema_path = ('a_list', 'schema') * args.depth + ('a_list', 'schema', 'type')
+        error = ValidationError(document_path, schema_path, errors.BAD_TYPE.code,
+                                'type', 'integer', 'x', ())
+        for level in range(args.depth, 0, -1):
+            error = ValidationError(
+                document_path[:2 * level], schema_path[:2 * level],
+                errors.SEQUENCE_SCHEMA.code, 'schema', {'type': 'integer'}, ['x'],
+                (ErrorList([error]),))
+        result.append(error)
+    return result
+
+
+def binary_errors(count, args):
+    """ Errors with a ``--value-size`` large binary value. """
+    value = bytes(range(256)) * (args.value_size // 256)
+    return [ValidationError(('a_blob', i), ('a_blob', 'maxlength'), errors.MAX_LENGTH.code,
+                            'maxlength', 16, value, (len(value),)) for i in range(count)]
+
+
+scenarios = {'flat': flat_errors, 'deep': deep_errors, 'binary': binary_errors}
+
+# json can only preserve binary values as typed values
+handler_settings = {
+    'binary': (BinaryErrorHandler, {}),
+    'json': (JSONErrorHandler, {'typed_values': True}),
+    'xml': (XMLErrorHandler, {}),
+}
+
+
+def serialize(handler, errors):
+    result = handler(errors)
+    if isinstance(result, str):
+        return result.encode()
+    elif isinstance(result, bytes):
+        return result
+    return tostring(result)
+
+
+def emit(handler, errors):
+    handler.start(None)
+    for error in errors:
+        handler.emit(error)
+    handler.end(None)
+
+
+# operations return the number of errors they processed and store the dumps
+# that later operations use in ``data``
+
+def run_call(handler_class, kwargs, errors, data):
+    data['dump'] = serialize(handler_class(**kwargs), errors)
+    return len(errors)
+
+
+def run_emit(handler_class, kwargs, errors, data):
+    buffer = BytesIO()
+    emit(handler_class(buffer, **kwargs), errors)
+    data['stream'] = buffer.getvalue()
+    return len(errors)
+
+
+def run_parse(handler_class, kwargs, errors, data):
+    return len(handler_class(**kwargs).parse(data['dump']))
+
+
+def run_read(handler_class, kwargs, errors, data):
+    return len(handler_class(**kwargs).read(BytesIO(data['stream'])))
+
+
+def run_iterate_file(handler_class, kwargs, errors, data):
+    return sum(1 for _ in handler_class(BytesIO(data['stream']), **kwargs))
+
+
+def run_iterate_socket(handler_class, kwargs, errors, data):
+    sender, receiver = socketpair()
+
+    def send():
+        emit(handler_class(sender, **kwargs), errors)
+        sender.close()
+
+    thread = Thread(target=send)
+    thread.start()
+    count = sum(1 for _ in handler_class(receiver, **kwargs))
+    thread.join()
+    receiver.close()
+    return count
+
+
+operations = {
+    'call': run_call,
+    'emit': run_emit,
+    'parse': run_parse,
+    'read': run_read,
+    'iterate_file': run_iterate_file,
+    'iterate_socket': run_iterate_socket,
+}
+
+
+def measure(operation, handler_class, kwargs, errors, data, trace_memory):
+    if trace_memory:
+        tracemalloc.start()
+    start = default_timer()
+    count = operation(handler_class, kwargs, errors, data)
+    seconds = default_timer() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if count != len(errors):
+        raise AssertionError('{} processed {} of {} errors.'.format(
+            operation.__name__, count, len(errors)))
+    return seconds, peak
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_revision(revision):
+    return subprocess.check_output(['git', 'rev-parse', '--short', revision],
+                                   cwd=project_root).decode().strip()
+
+
+def load_results(filename, commit):
+    """ Returns the latest stored results for a commit by their scenario,
+        scale, handler and operation. """
+    result = {}
+    if not path.exists(filename):
+        return result
+    with open(filename) as f:
+        for line in f:
+            record = json.loads(line)
+            if record['commit'] == commit:
+                key = (record['scenario'], record['errors'], record['handler'],
+                       record['operation'])
+                result[key] = record
+    return result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 10000],
+                        help='Numbers of top-level errors.')
+    parser.add_argument('--scenarios', nargs='+', choices=scenarios, default=list(scenarios))
+    parser.add_argument('--handlers', nargs='+', choices=handler_settings,
+                        default=['json', 'xml'])
+    parser.add_argument('--operations', nargs='+', choices=operations,
+                        default=list(operations))
+    parser.add_argument('--depth', type=int, default=8,
+                        help='Nesting depth of the deep group errors.')
+    parser.add_argument('--value-size', type=int, default=4096,
+                        help='Size of the binary values in bytes.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Don't measure the peak memory usage.")
+    parser.add_argument('--output', default=path.join(project_root, 'benchmarks',
+                                                      'results.jsonl'),
+                        help='A file that results are appended to.')
+    parser.add_argument('--compare', metavar='REVISION',
+                        help='Print ratios to the stored results of a revision.')
+    args = parser.parse_args()
+
+    commit = current_commit()
+    baseline = {}
+    if args.compare:
+        baseline = load_results(args.output, resolve_revision(args.compare))
+    records = []
+
+    print('{:<8} {:>8} {:<6} {:<15} {:>10} {:>12} {:>10} {:>12} {:>8}'.format(
+        'scenario', 'errors', 'format', 'operation', 'seconds', 'errors/s', 'MiB/s',
+        'peak KiB', 'ratio'))
+    for scenario in args.scenarios:
+        for scale in args.scales:
+            errors = scenarios[scenario](scale, args)
+            for handler in args.handlers:
+                handler_class, kwargs = handler_settings[handler]
+                data = {}
+                for name in args.operations:
+                    # parsing and reading use the results of serializing
+                    # and emitting
+                    if name == 'parse' and 'dump' not in data:
+                        run_call(handler_class, kwargs, errors, data)
+                    elif name in ('read', 'iterate_file') and 'stream' not in data:
+                        run_emit(handler_class, kwargs, errors, data)
+
+                    seconds, _ = measure(operations[name], handler_class, kwargs, errors,
+                                         data, False)
+                    peak = None
+                    if not args.no_memory:
+                        _, peak = measure(operations[name], handler_class, kwargs, errors,
+                                          data, True)
+
+                    size = len(data.get('dump' if name in ('call', 'parse') else 'stream', b''))
+                    record = {'commit': commit, 'date': datetime.now().isoformat(),
+                              'python': platform.python_version(), 'scenario': scenario,
+                              'errors': scale, 'handler': handler, 'operation': name,
+                              'seconds': seconds, 'bytes': size, 'peak_memory': peak}
+                    records.append(record)
+
+                    reference = baseline.get((scenario, scale, handler, name))
+                    print('{:<8} {:>8} {:<6} {:<15} {:>10.4f} {:>12.0f} {:>10.2f} {:>12} {:>8}'
+                          .format(scenario, scale, handler, name, seconds, scale / seconds,
+                                  size / 2 ** 20 / seconds,
+                                  '-' if peak is None else peak // 1024,
+                                  '-' if reference is None
+                                  else '{:.2f}'.format(seconds / reference['seconds'])))
+
+    with open(args.output, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+""" Compares the type dispatch of the XML :class:`Encoder` and
+    :class:`Decoder` with a lookup of ``_encode_<type name>`` and
+    ``_decode_<type name>`` methods on every value.
+
+    Run from the project's root with ``python -m benchmarks.xml_codec``.
+"""
+
+from argparse import ArgumentParser
+from collections import Sequence
+from os import path
+import sys
+from timeit import repeat
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), '..')))
+from cerberus_collections.error_handlers.xml import Decoder, Element, Encoder  # noqa: E402
+
+
+class GetattrEncoder(Encoder):
+    @classmethod
+    def encode(cls, tag, value):
+        value_type = type(value).__name__
+        encoder = getattr(cls, '_encode_' + value_type, None)
+        element = Element(tag, type=value_type)
+        if encoder is None:
+            element.text = str(value)
+        else:
+            encoded_value = encoder(value)
+            if isinstance(encoded_value, str):
+                element.text = encoded_value
+            elif isinstance(encoded_value, Sequence):
+                element.extend(encoded_value)
+            else:
+                raise RuntimeError
+        return element
+
+
+class GetattrDecoder(Decoder):
+    @classmethod
+    def decode(cls, element):
+        return getattr(cls, '_decode_' + element.attrib['type'])(element)
+
+
+def make_values(size):
+    return {'list': [(i, str(i), float(i)) for i in range(size)],
+            'dict': {str(i): [i, str(i), True] for i in range(size)}}
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=10000,
+                        help='Number of items in the encoded list and dict.')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, value in make_values(args.size).items():
+        element = Encoder.encode('value', value)
+        assert Decoder.decode(element) == GetattrDecoder.decode(element)
+
+        for label, encoder, decoder in (('getattr', GetattrEncoder, GetattrDecoder),
+                                        ('dispatch', Encoder, Decoder)):
+            encoding = min(repeat(lambda: encoder.encode('value', value),
+                                  number=1, repeat=args.repeat))
+            decoding = min(repeat(lambda: decoder.decode(element),
+                                  number=1, repeat=args.repeat))
+            print('{:<5} {:<9} encode: {:.3f}s  decode: {:.3f}s'
+                  .format(name, label, encoding, decoding))
+
+
+if __name__ == '__main__':
+    main()
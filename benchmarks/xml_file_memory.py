@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+""" Compares the peak memory usage of iterating over XML error files of
+    growing sizes with an ``iterparse`` loop that keeps the parsed tree and
+    with :meth:`XMLErrorHandler.iterread` from a file object and from a path.
+
+    Run from the project's root with ``python -m benchmarks.xml_file_memory``.
+"""
+
+from argparse import ArgumentParser
+from os import path
+from resource import RUSAGE_SELF, getrusage
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), '..')))
+from lxml.etree import iterparse  # noqa: E402
+
+from cerberus_collections import Validator, XMLErrorHandler  # noqa: E402
+
+
+def write_file(filename, count):
+    """ Writes a file with ``count`` times the errors of a sample validation. """
+    validator = Validator({'a_list': {'type': 'list', 'schema': {'type': 'integer'}},
+                           'number': {'min': 0}})
+    validator({'a_list': ['x' * 64] * 8, 'number': -1})
+    handler = XMLErrorHandler()
+    handler(validator)
+    chunk = b''.join(handler._as_string(x) for x in handler.root)
+    with open(filename, 'wb') as f:
+        f.write(b'<errors>')
+        for _ in range(count):
+            f.write(chunk)
+        f.write(b'</errors>')
+
+
+def iterate_keeping_tree(filename):
+    handler, depth = XMLErrorHandler(), 0
+    with open(filename, 'rb') as f:
+        for event, element in iterparse(f, events=('start', 'end')):
+            if element.tag != 'error':
+                continue
+            depth += 1 if event == 'start' else -1
+            if event == 'end' and not depth:
+                handler.parse(element)
+
+
+def iterate_file(filename):
+    with open(filename, 'rb') as f:
+        for _ in XMLErrorHandler(buffer=f):
+            pass
+
+
+def iterate_path(filename):
+    for _ in XMLErrorHandler().iterread(filename):
+        pass
+
+
+methods = {'iterparse': iterate_keeping_tree, 'file': iterate_file, 'path': iterate_path}
+
+
+def measure(method, filename):
+    """ Runs a method in a new process and returns its peak RSS in KiB. """
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'benchmarks.xml_file_memory', '--run', method, filename],
+        cwd=path.abspath(path.join(path.dirname(__file__), '..')))
+    return int(output)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 4000, 16000],
+                        help='Repetitions of the sample errors per file.')
+    parser.add_argument('--run', nargs=2, metavar=('METHOD', 'FILENAME'),
+                        help='Internal, runs a method and prints its peak RSS.')
+    args = parser.parse_args()
+
+    if args.run:
+        method, filename = args.run
+        methods[method](filename)
+        print(getrusage(RUSAGE_SELF).ru_maxrss)
+        return
+
+    print('{:>12} {:>14} {:>14} {:>14}'.format('file size', *methods))
+    with TemporaryDirectory() as directory:
+        for count in args.counts:
+            filename = path.join(directory, 'errors.xml')
+            write_file(filename, count)
+            results = ['{} KiB'.format(measure(x, filename)) for x in methods]
+            print('{:>8} KiB {:>14} {:>14} {:>14}'.format(
+                path.getsize(filename) // 1024, *results))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,26 @@
+import sys
+
 import cerberus
 from cerberus.utils import validator_factory  # noqa: F401
 
-from cerberus_collections.error_handlers import *  # noqa: F401, F403
+from cerberus_collections import error_handlers
+from cerberus_collections.error_handlers import JSONErrorHandler  # noqa: F401
 from cerberus_collections.versions import __version__  # noqa: F401
 
 VanillaValidator = Validator = cerberus.Validator
+__all__ = ['Validator', 'VanillaValidator', 'validate_many', 'validator_factory'] + \
+    error_handlers.__all__
+
+
+def __getattr__(name):
+    if name in error_handlers.lazy_handlers:
+        return getattr(error_handlers, name)
+    if name == 'validate_many':
+        from cerberus_collections import bulk
+        return bulk.validate_many
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+if sys.version_info < (3, 7):  # no support for module level __getattr__ (PEP 562)
+    globals().update((x, getattr(error_handlers, x)) for x in error_handlers.__all__)
+    from cerberus_collections.bulk import validate_many  # noqa: F401
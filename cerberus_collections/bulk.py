@@ -0,0 +1,121 @@
+from collections import Mapping
+from itertools import chain
+from os import cpu_count
+import pickle
+from threading import local
+
+from cerberus import Validator
+
+from cerberus_collections.error_handlers import JSONErrorHandler
+from cerberus_collections.utils import batches, results_in_order
+
+
+# the executors are imported when they're used, as loading the process pool
+# is expensive
+executors = {'process': 'ProcessPoolExecutor', 'thread': 'ThreadPoolExecutor'}
+_worker_state = local()
+
+
+def _validate_chunk(arguments):
+    # a worker's validator is created once from the configuration that is
+    # sent with each chunk, as executors can't be initialized before Python
+    # 3.7; it's pickled for processes
+    configuration, chunk = arguments
+    if getattr(_worker_state, 'configuration', None) != configuration:
+        if isinstance(configuration, bytes):
+            validator_class, schema, validator_kwargs = pickle.loads(configuration)
+        else:
+            validator_class, schema, validator_kwargs = configuration
+        _worker_state.validator = validator_class(schema, **validator_kwargs)
+        _worker_state.configuration = configuration
+    validator = _worker_state.validator
+    result = []
+    for document_id, document in chunk:
+        validator(document)
+        result.append((document_id, validator._errors))
+    return result
+
+
+def _chunks(documents, size):
+    if isinstance(documents, Mapping):
+        documents = documents.items()
+    else:
+        documents = enumerate(documents)
+    return batches(documents, size)
+
+
+def validate_many(documents, schema, error_handler=JSONErrorHandler, workers=None,
+                  executor='process', chunk_size=64, validator_class=Validator,
+                  **validator_kwargs):
+    """ Validates many documents against one schema in parallel and emits all
+        errors to one stream.
+
+        The documents are validated in chunks by a pool of workers. Their
+        errors are emitted in the order of the documents by handlers that
+        share the configured ``buffer``, each one with the
+        ``document_id`` of the document whose errors it emits and
+        ``consider_context`` enabled.
+
+        :param documents: The documents to validate, either a mapping of
+                          document ids to documents or an iterable whose
+                          items' positions are used as ids.
+        :param schema: The validation schema.
+        :param error_handler: An error handler class or a tuple of such and a
+                              mapping of keyword arguments to initialize it
+                              with, usually including a ``buffer``.
+        :param workers: The number of workers, defaults to the number of
+                        processors.
+        :type workers: int
+        :param executor: Validate in ``process``\\es or ``thread``\\s. As
+                         validation is CPU-bound, threads don't scale across
+                         processors, they avoid the pickling of documents and
+                         errors though.
+        :type executor: str
+        :param chunk_size: The number of documents that are passed to a worker
+                           at once.
+        :type chunk_size: int
+        :param validator_class: The validator class, it must be importable by
+                                worker processes. Also the ``schema`` and
+                                ``validator_kwargs`` must be picklable for
+                                these.
+        :param validator_kwargs: Further arguments to initialize validators.
+        :returns: The ids of the documents that failed to validate.
+        :rtype: list
+    """
+    import concurrent.futures
+    executor_class = getattr(concurrent.futures, executors[executor])
+
+    if isinstance(error_handler, tuple):
+        handler_class, handler_kwargs = error_handler
+    else:
+        handler_class, handler_kwargs = error_handler, {}
+    workers = workers or cpu_count() or 1
+
+    # this handler keeps the emission session for the buffer open, so that
+    # the errors of all documents are emitted into one container
+    framing_handler = handler_class(**handler_kwargs)
+    framing_handler.start(None)
+
+    configuration = (validator_class, schema, validator_kwargs)
+    if executor == 'process':
+        configuration = pickle.dumps(configuration)
+    chunks = ((configuration, x) for x in _chunks(documents, chunk_size))
+
+    invalid_documents = []
+    with executor_class(workers) as pool:
+        try:
+            for document_id, errors in chain.from_iterable(results_in_order(
+                    pool, _validate_chunk, chunks, 2 * workers)):
+                if not errors:
+                    continue
+                invalid_documents.append(document_id)
+                handler = handler_class(**dict(handler_kwargs, consider_context=True,
+                                               document_id=document_id))
+                handler.start(None)
+                for error in errors:
+                    handler.emit(error)
+                handler.end(None)
+        finally:
+            framing_handler.end(None)
+
+    return invalid_documents
@@ -1,11 +1,39 @@
+from importlib import import_module
+from importlib.util import find_spec
+import sys
+
 __all__ = []
 
 from cerberus_collections.error_handlers.json import JSONErrorHandler  # noqa: E402
 __all__.append(JSONErrorHandler.__name__)
 
-try:
-    from cerberus_collections.error_handlers.xml import XMLErrorHandler
-except ImportError:
-    pass
-else:
-    __all__.append(XMLErrorHandler.__name__)
+# handlers with expensive or optional dependencies are imported on first access,
+# they're mapped to their module and the optional distribution they require
+lazy_handlers = {
+    'AggregatingErrorHandler': ('cerberus_collections.error_handlers.aggregating', None),
+    'AsyncJSONErrorHandler': ('cerberus_collections.error_handlers.asynchronous.json', None),
+    'AsyncXMLErrorHandler': ('cerberus_collections.error_handlers.asynchronous.xml', 'lxml'),
+    'BinaryErrorHandler': ('cerberus_collections.error_handlers.binary', None),
+    'XMLErrorHandler': ('cerberus_collections.error_handlers.xml', 'lxml'),
+}
+
+for _name, (_module, _requirement) in lazy_handlers.items():
+    if _requirement is None or find_spec(_requirement) is not None:
+        __all__.append(_name)
+
+
+def __getattr__(name):
+    if name not in lazy_handlers:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+    handler = getattr(import_module(lazy_handlers[name][0]), name)
+    globals()[name] = handler
+    return handler
+
+
+if sys.version_info < (3, 7):  # no support for module level __getattr__ (PEP 562)
+    for _name in lazy_handlers:
+        try:
+            __getattr__(_name)
+        except (ImportError, SyntaxError):
+            if _name in __all__:
+                __all__.remove(_name)
@@ -0,0 +1,270 @@
+from random import Random
+from threading import Lock
+
+from cerberus import Validator
+from cerberus.errors import BaseErrorHandler
+
+from cerberus_collections.error_handlers.json import JSONErrorHandler
+from cerberus_collections.error_handlers.mixins import ValidationContext
+
+
+class ErrorSummary:
+    """ Counts errors per schema path, rule and error code and keeps a
+        uniform random sample of the documents' ids, paths and values for each
+        of these. The memory usage doesn't depend on the number of counted
+        errors, only on the number of distinct schema rules that failed.
+
+        Instances can be shared by handlers in different threads and summaries
+        from other processes can be merged, they can be pickled.
+
+        :param sample_size: The maximum number of samples per rule.
+        :type sample_size: int
+        :param seed: A seed for the sampling.
+    """
+    def __init__(self, sample_size=5, seed=None):
+        self.sample_size = sample_size
+        self.entries = {}
+        self._lock = Lock()
+        self._random = Random(seed)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, error, document_id=None):
+        """ Counts an error and the errors it groups.
+
+            :param error: The error to count.
+            :type error: :class:`~cerberus.errors.ValidationError`
+            :param document_id: The id of the document the error was found in.
+        """
+        with self._lock:
+            self._add(error, document_id)
+
+    def _add(self, error, document_id):
+        key = (tuple(error.schema_path), error.rule, error.code)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [0, []]
+        entry[0] += 1
+
+        # reservoir sampling keeps each counted error with the same probability
+        samples = entry[1]
+        sample = (document_id, tuple(error.document_path), error.value)
+        if len(samples) < self.sample_size:
+            samples.append(sample)
+        else:
+            i = self._random.randrange(entry[0])
+            if i < self.sample_size:
+                samples[i] = sample
+
+        if error.is_group_error:
+            for child_error in error.child_errors:
+                self._add(child_error, document_id)
+
+    def merge(self, other):
+        """ Adds the counts and samples of another summary.
+
+            :param other: The summary to merge.
+            :type other: :class:`ErrorSummary`
+        """
+        # the other summary may still be counted into, it's copied first and
+        # both locks are never held at once to avoid deadlocks
+        with other._lock:
+            items = [(k, c, list(s)) for k, (c, s) in other.entries.items()]
+        with self._lock:
+            for key, count, samples in items:
+                entry = self.entries.get(key)
+                if entry is None:
+                    self.entries[key] = [count, list(samples[:self.sample_size])]
+                else:
+                    entry[1] = self._merge_samples(entry[1], entry[0], samples, count)
+                    entry[0] += count
+
+    def _merge_samples(self, samples, count, other_samples, other_count):
+        # draws from both samples in proportion to the errors they represent
+        samples, other_samples = list(samples), list(other_samples)
+        self._random.shuffle(samples)
+        self._random.shuffle(other_samples)
+        result = []
+        while len(result) < self.sample_size and (samples or other_samples):
+            if samples and (not other_samples or
+                            self._random.random() * (count + other_count) < count):
+                result.append(samples.pop())
+                count -= 1
+            else:
+                result.append(other_samples.pop())
+                other_count -= 1
+        return result
+
+    def as_list(self):
+        """ Returns the summary as list of mappings with the keys
+            ``schema_path``, ``rule``, ``code``, ``count`` and ``samples``,
+            ordered by descending counts. Samples are mappings with the keys
+            ``document_id``, ``document_path`` and ``value``.
+
+            :rtype: list
+        """
+        with self._lock:
+            entries = sorted(self.entries.items(), key=lambda x: -x[1][0])
+            return [{'schema_path': list(schema_path), 'rule': rule, 'code': code,
+                     'count': count,
+                     'samples': [{'document_id': document_id,
+                                  'document_path': list(document_path),
+                                  'value': value}
+                                 for document_id, document_path, value in samples]}
+                    for (schema_path, rule, code), (count, samples) in entries]
+
+    @classmethod
+    def from_list(cls, entries, sample_size=5, seed=None):
+        """ Makes a summary from the representation that :meth:`as_list`
+            returns.
+
+            :param entries: The summary's entries.
+            :type entries: list
+        """
+        result = cls(sample_size, seed)
+        for entry in entries:
+            key = (tuple(entry['schema_path']), entry['rule'], entry['code'])
+            samples = [(x['document_id'], tuple(x['document_path']), x['value'])
+                       for x in entry['samples']]
+            result.entries[key] = [entry['count'], samples[:sample_size]]
+        return result
+
+    def render(self, handler):
+        """ Encodes the summary with a JSON or XML handler, its values are
+            encoded like the values of errors and the handler's validation
+            signature is added.
+
+            :param handler: The handler to encode with.
+            :type handler: :class:`~cerberus_collections.JSONErrorHandler` or
+                           :class:`~cerberus_collections.XMLErrorHandler`
+            :returns: A json-encoded mapping with a ``summary`` and the
+                      signature's fields or a ``summary``-element with the
+                      signature as attributes.
+            :rtype: :class:`str` or :class:`lxml._Element`
+        """
+        if isinstance(handler, JSONErrorHandler):
+            return handler._error_encoder(None)._encode_value(
+                dict(handler._validation_signature, summary=self.as_list()), 0)
+
+        from cerberus_collections.error_handlers.xml import XMLErrorHandler
+        if not isinstance(handler, XMLErrorHandler):
+            raise TypeError('Summaries can only be rendered with JSON or XML handlers.')
+        element = handler.encoder('summary', self.as_list())
+        element.attrib.update(handler._validation_attributes)
+        return element
+
+    @classmethod
+    def load(cls, data, handler, sample_size=5, seed=None):
+        """ Decodes a summary that :meth:`render` encoded with a handler of the
+            same type and configuration. The validation signature is checked
+            if the handler's ``consider_context`` is set.
+
+            :param data: The rendered summary.
+            :type data: :class:`str`, :class:`bytes` or :class:`lxml._Element`
+            :param handler: The handler to decode with.
+            :type handler: :class:`~cerberus_collections.JSONErrorHandler` or
+                           :class:`~cerberus_collections.XMLErrorHandler`
+            :rtype: :class:`ErrorSummary`
+        """
+        if isinstance(handler, JSONErrorHandler):
+            mapping = handler._loads(data)
+            entries = mapping.pop('summary')
+            if handler.consider_context:
+                handler._validate_signature(handler._pop_validation_signature(mapping))
+            return cls.from_list(entries, sample_size, seed)
+
+        from cerberus_collections.error_handlers.xml import \
+            XMLErrorHandler, element_from_string
+        if not isinstance(handler, XMLErrorHandler):
+            raise TypeError('Summaries can only be loaded with JSON or XML handlers.')
+        if isinstance(data, (str, bytes)):
+            data = element_from_string(data)
+        if handler.consider_context:
+            handler._validate_signature(data)
+        return cls.from_list(handler.decoder(data), sample_size, seed)
+
+
+class AggregatingErrorHandler(BaseErrorHandler, ValidationContext):
+    """ An error handler that counts the errors that are emitted during
+        validations per schema rule in an :class:`ErrorSummary` instead of
+        storing them. Errors that are grouped by others are counted too.
+
+        Calling an instance without arguments returns the list representation
+        of its summary, see :meth:`ErrorSummary.as_list`. If called with a
+        sequence of :class:`~cerberus.errors.ValidationError` instances or a
+        :class:`~cerberus.Validator`, the summary of these is returned, that's
+        what the :attr:`~cerberus.Validator.errors` of a validator with this
+        handler bound as its :attr:`~cerberus.Validator.error_handler` are.
+
+        An instance is iterable and returns the summary's entries.
+
+        :param summary: A summary to count into, it may be shared with other
+                        handlers. A new one is created if :obj:`None`.
+        :type summary: :class:`ErrorSummary`
+        :param sample_size: The sample size of a new summary.
+        :type sample_size: int
+        :param consider_context: Add the ``document_id`` and ``schema_id`` to
+                                 rendered summaries and check these while
+                                 loading.
+        :type consider_context: bool
+        :param document_id: An identifier that refers the document being
+                            validated, it's stored with sampled errors.
+        :param schema_id: An identifier that refers the used validation schema.
+    """
+    def __init__(self, summary=None, sample_size=5, consider_context=False,
+                 document_id=None, schema_id=None):
+        if summary is None:
+            summary = ErrorSummary(sample_size)
+        self.summary = summary
+        self.consider_context = consider_context
+        self.document_id = document_id
+        self.schema_id = schema_id
+
+    def __call__(self, errors=None):
+        if errors is None:
+            return self.summary.as_list()
+        if isinstance(errors, Validator):
+            errors = errors._errors
+        summary = ErrorSummary(self.summary.sample_size)
+        for error in errors:
+            summary.add(error, self.document_id)
+        return summary.as_list()
+
+    def __iter__(self):
+        return iter(self.summary.as_list())
+
+    def add(self, error):
+        self.summary.add(error, self.document_id)
+
+    def clear(self):
+        """ Replaces the summary with an empty one. """
+        self.summary = ErrorSummary(self.summary.sample_size)
+
+    emit = add
+
+    def merge(self, other):
+        """ Merges the summary of another handler or a summary into this
+            handler's summary.
+
+            :param other: The handler or summary to merge.
+            :type other: :class:`AggregatingErrorHandler` or
+                         :class:`ErrorSummary`
+        """
+        if isinstance(other, AggregatingErrorHandler):
+            other = other.summary
+        self.summary.merge(other)
+
+    def render(self, handler):
+        """ Renders the summary with a JSON or XML handler, see
+            :meth:`ErrorSummary.render`. """
+        return self.summary.render(handler)
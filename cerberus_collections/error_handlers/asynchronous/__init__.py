@@ -0,0 +1,67 @@
+from asyncio import StreamReader, StreamWriter
+from collections import deque
+
+from cerberus_collections.error_handlers.mixins import BufferAdapter
+
+
+class AsyncBufferAdapter(BufferAdapter):
+    """ Extends :class:`BufferAdapter` with support for :mod:`asyncio` streams.
+
+        Errors are written to a :class:`asyncio.StreamWriter` while a
+        validation runs, :meth:`drain` must be awaited afterwards to apply
+        backpressure. Errors are read from a :class:`asyncio.StreamReader`
+        with ``async for``.
+
+        Subclasses implement ``_make_stream_parser`` and ``_parse_chunk``.
+    """
+    @property
+    def buffer(self):
+        return self._buffer
+
+    @buffer.setter
+    def buffer(self, buffer):
+        if isinstance(buffer, (StreamReader, StreamWriter)):
+            BufferAdapter.buffer.fset(self, None)
+            self._buffer_type = type(buffer)
+            self._next_from_buffer = self._next_from_stream
+            if isinstance(buffer, StreamWriter):
+                self._write_through = self._write_to_stream
+                self._write_to_buffer = self._write_coalesced
+            self._buffer = buffer
+        else:
+            BufferAdapter.buffer.fset(self, buffer)
+
+    def __aiter__(self):
+        if not isinstance(self._buffer, StreamReader):
+            raise RuntimeError("{} must have a StreamReader as 'buffer'-property."
+                               .format(repr(self)))
+        self._stream_parser = self._make_stream_parser()
+        self._stream_decompressor = self._make_decompressor()
+        self._parsed_errors = deque()
+        return self
+
+    async def __anext__(self):
+        while not self._parsed_errors:
+            chunk = await self._buffer.read(self.chunk_size)
+            if not chunk:
+                raise StopAsyncIteration
+            if self._stream_decompressor is not None:
+                chunk = self._stream_decompressor.decompress(chunk)
+            if chunk:
+                self._parsed_errors.extend(self._parse_chunk(chunk))
+        return self._parsed_errors.popleft()
+
+    async def drain(self):
+        """ Writes coalesced data to a stream and waits until it's
+            appropriate to resume writing. """
+        if isinstance(self._buffer, StreamWriter):
+            self._flush_write_buffer()
+            await self._buffer.drain()
+
+    def _next_from_stream(self):
+        raise TypeError('Use async iteration to read errors from a StreamReader.')
+
+    def _write_to_stream(self, data):
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        self._buffer.write(data)
@@ -0,0 +1,27 @@
+from cerberus_collections.error_handlers.asynchronous import AsyncBufferAdapter
+from cerberus_collections.error_handlers.json import \
+    JSONErrorHandler, JSONLinesScanner, JSONMappingScanner
+
+
+class AsyncJSONErrorHandler(AsyncBufferAdapter, JSONErrorHandler):
+    """ A :class:`~cerberus_collections.JSONErrorHandler` that also accepts
+        :class:`asyncio.StreamWriter` and :class:`asyncio.StreamReader`
+        instances as ``buffer``.
+
+        .. code-block:: python
+
+            validator = Validator(schema, error_handler=AsyncJSONErrorHandler(writer))
+            validator(document)
+            await validator.error_handler.drain()
+
+            async for error in AsyncJSONErrorHandler(reader):
+                ...
+    """
+    def _make_stream_parser(self):
+        if self.format == 'jsonl':
+            return JSONLinesScanner()
+        return JSONMappingScanner(level=2 if self.envelope else 1)
+
+    def _parse_chunk(self, chunk):
+        errors = (self._error_from_mapping(x) for x in self._stream_parser.feed(chunk))
+        return [x for x in errors if x is not None]
@@ -0,0 +1,23 @@
+from cerberus_collections.error_handlers.asynchronous import AsyncBufferAdapter
+from cerberus_collections.error_handlers.xml import ErrorStreamParser, XMLErrorHandler
+
+
+class AsyncXMLErrorHandler(AsyncBufferAdapter, XMLErrorHandler):
+    """ A :class:`~cerberus_collections.XMLErrorHandler` that also accepts
+        :class:`asyncio.StreamWriter` and :class:`asyncio.StreamReader`
+        instances as ``buffer``.
+
+        .. code-block:: python
+
+            validator = Validator(schema, error_handler=AsyncXMLErrorHandler(writer))
+            validator(document)
+            await validator.error_handler.drain()
+
+            async for error in AsyncXMLErrorHandler(reader):
+                ...
+    """
+    def _make_stream_parser(self):
+        return ErrorStreamParser()
+
+    def _parse_chunk(self, chunk):
+        return self._parse_stream_elements(self._stream_parser.feed(chunk))
@@ -0,0 +1,590 @@
+from datetime import date, datetime
+from io import IOBase, TextIOBase
+from socket import socket
+from struct import Struct, error as StructError
+
+from cerberus import Validator
+from cerberus.errors import BaseErrorHandler, ErrorList, ValidationError
+
+from cerberus_collections.error_handlers.exceptions import DecodingError
+from cerberus_collections.error_handlers.mixins import \
+    BufferAdapter, EmissionSession, ValidationContext
+from cerberus_collections.utils import date_from_isoformat, datetime_from_isoformat
+
+
+# a record consists of its kind, the payload's length and the payload
+record_header = Struct('>cI')
+double = Struct('>d')
+
+# a stream record opens a stream and resets the tables of interned paths,
+# a signature record applies to all following error records of the stream,
+# a path record adds a path to the table
+STREAM, SIGNATURE, PATH, ERROR = b'H', b'S', b'P', b'E'
+STREAM_MAGIC = b'cerberus-errors\x01'
+
+
+def _write_varint(out, number):
+    while number > 0x7f:
+        out.append(number & 0x7f | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data, position):
+    result = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+
+def _write_sized(out, data):
+    _write_varint(out, len(data))
+    out += data
+
+
+def _read_sized(data, position):
+    size, position = _read_varint(data, position)
+    return data[position:position + size], position + size
+
+
+def _encode_none(out, value):
+    out += b'N'
+
+
+def _encode_bool(out, value):
+    out += b'T' if value else b'F'
+
+
+def _encode_int(out, value):
+    out += b'i'
+    _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _encode_float(out, value):
+    out += b'f'
+    out += double.pack(value)
+
+
+def _encode_complex(out, value):
+    out += b'c'
+    out += double.pack(value.real)
+    out += double.pack(value.imag)
+
+
+def _encode_sized(tag, convert):
+    def encoder(out, value):
+        out += tag
+        _write_sized(out, convert(value))
+    return encoder
+
+
+def _encode_items(tag):
+    def encoder(out, value):
+        out += tag
+        _write_varint(out, len(value))
+        for item in value:
+            encode_value(out, item)
+    return encoder
+
+
+def _encode_dict(out, value):
+    out += b'd'
+    _write_varint(out, len(value))
+    for key, item in value.items():
+        encode_value(out, key)
+        encode_value(out, item)
+
+
+value_encoders = {
+    bool: _encode_bool,
+    bytearray: _encode_sized(b'B', bytes),
+    bytes: _encode_sized(b'b', bytes),
+    complex: _encode_complex,
+    date: _encode_sized(b'D', lambda x: x.isoformat().encode()),
+    datetime: _encode_sized(b'M', lambda x: x.isoformat().encode()),
+    dict: _encode_dict,
+    float: _encode_float,
+    frozenset: _encode_items(b'z'),
+    int: _encode_int,
+    list: _encode_items(b'l'),
+    set: _encode_items(b'e'),
+    str: _encode_sized(b's', str.encode),
+    tuple: _encode_items(b't'),
+    type(None): _encode_none,
+}
+
+
+def encode_value(out, value):
+    """ Appends the binary representation of a value to a
+        :class:`bytearray`. Subclasses of the supported types are encoded
+        as their closest supported base class.
+
+        :raises TypeError: If the value's type isn't supported.
+    """
+    encoder = value_encoders.get(type(value))
+    if encoder is None:
+        for base in type(value).__mro__:
+            encoder = value_encoders.get(base)
+            if encoder is not None:
+                break
+        else:
+            raise TypeError("Can't encode values of type {}.".format(type(value).__name__))
+    encoder(out, value)
+
+
+def _decode_int(data, position):
+    number, position = _read_varint(data, position)
+    return (number >> 1) ^ -(number & 1), position
+
+
+def _decode_float(data, position):
+    return double.unpack_from(data, position)[0], position + double.size
+
+
+def _decode_complex(data, position):
+    real, = double.unpack_from(data, position)
+    imag, = double.unpack_from(data, position + double.size)
+    return complex(real, imag), position + 2 * double.size
+
+
+def _decode_sized(_type):
+    def decoder(data, position):
+        value, position = _read_sized(data, position)
+        return _type(value), position
+    return decoder
+
+
+def _decode_text(parse):
+    def decoder(data, position):
+        value, position = _read_sized(data, position)
+        return parse(value.decode()), position
+    return decoder
+
+
+def _decode_items(_type):
+    def decoder(data, position):
+        count, position = _read_varint(data, position)
+        result = []
+        for _ in range(count):
+            item, position = decode_value(data, position)
+            result.append(item)
+        return _type(result), position
+    return decoder
+
+
+def _decode_dict(data, position):
+    count, position = _read_varint(data, position)
+    result = {}
+    for _ in range(count):
+        key, position = decode_value(data, position)
+        result[key], position = decode_value(data, position)
+    return result, position
+
+
+value_decoders = {
+    ord('B'): _decode_sized(bytearray),
+    ord('D'): _decode_text(date_from_isoformat),
+    ord('F'): lambda data, position: (False, position),
+    ord('M'): _decode_text(datetime_from_isoformat),
+    ord('N'): lambda data, position: (None, position),
+    ord('T'): lambda data, position: (True, position),
+    ord('b'): _decode_sized(bytes),
+    ord('c'): _decode_complex,
+    ord('d'): _decode_dict,
+    ord('e'): _decode_items(set),
+    ord('f'): _decode_float,
+    ord('i'): _decode_int,
+    ord('l'): _decode_items(list),
+    ord('s'): _decode_text(str),
+    ord('t'): _decode_items(tuple),
+    ord('z'): _decode_items(frozenset),
+}
+
+
+def decode_value(data, position=0):
+    """ Decodes a value that :func:`encode_value` encoded.
+
+        :param data: The encoded data.
+        :type data: :class:`bytes`
+        :param position: The offset of the value in ``data``.
+        :type position: int
+        :returns: A two-value tuple with the value and the offset of the data
+                  that follows it.
+    """
+    tag = data[position]
+    try:
+        decoder = value_decoders[tag]
+    except KeyError:
+        raise DecodingError(chr(tag), bytes(data[position:position + 16]))
+    try:
+        return decoder(data, position + 1)
+    except (IndexError, StructError, ValueError):
+        raise DecodingError(chr(tag), bytes(data[position:position + 16]))
+
+
+def make_record(kind, payload):
+    """ Prefixes a record's payload with its kind and length. """
+    return record_header.pack(kind, len(payload)) + payload
+
+
+class RecordScanner:
+    """ Extracts complete records from consecutive chunks of a binary error
+        stream. As records are prefixed with their length, only their
+        headers are inspected.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        """ Consumes a chunk and returns the records that were completed
+            with it.
+
+            :param chunk: The next part of the stream.
+            :type chunk: :class:`bytes`
+            :returns: A list of two-value tuples with the records' kinds and
+                      payloads.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        result = []
+        position, header_size = 0, record_header.size
+        while len(buffer) - position >= header_size:
+            kind, length = record_header.unpack_from(buffer, position)
+            end = position + header_size + length
+            if end > len(buffer):
+                break
+            result.append((kind, bytes(buffer[position + header_size:end])))
+            position = end
+        del buffer[:position]
+        return result
+
+
+class ErrorRecordEncoder:
+    """ Encodes errors to records. Paths that consist of strings and
+        integers are interned: a path record is produced when such a path
+        first occurs and errors refer to it by its position in the table.
+
+        :param paths: The table of interned paths that is shared by all
+                      encoders writing to the same stream.
+        :type paths: dict
+    """
+    def __init__(self, paths=None):
+        self.paths = {} if paths is None else paths
+
+    def encode(self, error):
+        """ Returns the records that represent an error, preceded by the
+            definitions of the paths it uses first.
+
+            :rtype: bytes
+        """
+        out, definitions = bytearray(), []
+        self._encode_error(out, error, definitions)
+        return b''.join([make_record(PATH, x) for x in definitions] +
+                        [make_record(ERROR, bytes(out))])
+
+    def _encode_error(self, out, error, definitions):
+        _write_varint(out, error.code)
+        encode_value(out, error.rule)
+        encode_value(out, error.constraint)
+        self._encode_path(out, error.document_path, definitions)
+        self._encode_path(out, error.schema_path, definitions)
+        encode_value(out, error.value)
+
+        if error.is_group_error:
+            _write_varint(out, len(error.child_errors))
+            for child_error in error.child_errors:
+                self._encode_error(out, child_error, definitions)
+            encode_value(out, tuple(error.info[1:]))
+        else:
+            encode_value(out, tuple(error.info))
+
+    def _encode_path(self, out, path, definitions):
+        # references are shifted by one, zero precedes a literal path
+        index = self.paths.get(path)
+        if index is None:
+            if not all(type(x) is str or type(x) is int for x in path):
+                out.append(0)
+                encode_value(out, tuple(path))
+                return
+            index = self.paths[path] = len(self.paths)
+            definition = bytearray()
+            encode_value(definition, tuple(path))
+            definitions.append(bytes(definition))
+        _write_varint(out, index + 1)
+
+
+class ErrorRecordDecoder:
+    """ Decodes the records of a stream and keeps track of its interned
+        paths and current validation signature. """
+    def __init__(self):
+        self.paths = []
+        self.signature = {}
+
+    def decode(self, kind, payload):
+        """ Processes a record.
+
+            :returns: The decoded error if it's an error record, otherwise
+                      :obj:`None`.
+        """
+        if kind == ERROR:
+            return self._decode_error(payload, 0)[0]
+        elif kind == PATH:
+            self.paths.append(decode_value(payload)[0])
+        elif kind == SIGNATURE:
+            self.signature = decode_value(payload)[0]
+        elif kind == STREAM:
+            if payload != STREAM_MAGIC:
+                raise DecodingError('stream', payload)
+            self.paths, self.signature = [], {}
+        else:
+            raise DecodingError('record', kind)
+
+    def _decode_error(self, data, position):
+        code, position = _read_varint(data, position)
+        rule, position = decode_value(data, position)
+        constraint, position = decode_value(data, position)
+        document_path, position = self._decode_path(data, position)
+        schema_path, position = self._decode_path(data, position)
+        value, position = decode_value(data, position)
+        error = ValidationError(document_path, schema_path, code, rule, constraint, value,
+                                info=())
+
+        if error.is_group_error:
+            count, position = _read_varint(data, position)
+            child_errors = ErrorList()
+            for _ in range(count):
+                child_error, position = self._decode_error(data, position)
+                child_errors.append(child_error)
+            info, position = decode_value(data, position)
+            error.info = (child_errors,) + info
+        else:
+            error.info, position = decode_value(data, position)
+
+        return error, position
+
+    def _decode_path(self, data, position):
+        index, position = _read_varint(data, position)
+        if not index:
+            return decode_value(data, position)
+        try:
+            return self.paths[index - 1], position
+        except IndexError:
+            raise DecodingError('path', index - 1)
+
+
+class BinaryErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
+    """ An error handler that (de-)serializes cerberus validation errors to and
+        from a compact binary format.
+
+        A stream consists of records that are prefixed with their kind and
+        length, so readers don't need to scan the data to find them. Paths
+        that repeat within a stream are written once and referenced by the
+        following errors, the validation signature is written whenever it
+        changes and applies to the errors that follow. :class:`bytes` are
+        written as is.
+
+        Calling an instance without arguments returns the
+        errors that were collected during the last validation of a
+        :class:`~cerberus.Validator`, if the handler
+        was bound to its :attr:`~cerberus.Validator.error_handler` property, as
+        :class:`bytes`. That's what happens when you get the
+        :attr:`~cerberus.Validator.errors` of a validator with this handler
+        bound as its :attr:`~cerberus.Validator.error_handler`.
+
+        If called with a sequence of :class:`~cerberus.errors.ValidationError`
+        instances as argument, the returned stream represents these.
+
+        During cerberus' validation it writes records to a ``buffer`` object
+        if provided.
+
+        An instance is iterable and returns errors it reads from the ``buffer``
+        object.
+
+        All configuration options are accessible as instance properties.
+
+        :param buffer: An object for I/O when emitting and iterating.
+        :type buffer: :class:`io.BufferedIOBase` (like files opened in binary
+                      mode), :class:`socket.socket` or :obj:`None`
+        :param consider_context: Write ``document_id`` and ``schema_id`` and check
+                                 these while parsing.
+        :type consider_context: bool
+        :param document_id: An identifier that refers the document being validated.
+        :type document_id: str
+        :param schema_id: An identifier that refers the used validation schema.
+        :type schema_id: str
+        :param chunk_size: The amount of data that is read at once from a
+                           ``buffer`` while iterating.
+        :type chunk_size: int
+        :param write_buffer_size: Coalesce emitted data and write it to the
+                                  ``buffer`` once this many bytes are
+                                  collected or the validation ends.
+                                  ``0`` writes every fragment immediately.
+        :type write_buffer_size: int
+        :param write_buffer_timeout: Also write coalesced data when this many
+                                     seconds have passed since the last write.
+        :type write_buffer_timeout: float or :obj:`None`
+        :param compression: Compress emitted data and decompress data that is
+                            read from a ``buffer`` with ``gzip``, ``lzma``,
+                            ``zstd`` (requires ``zstandard``) or ``lz4``.
+        :type compression: str or :obj:`None`
+    """
+    encoding = 'utf-8'
+
+    def __init__(self, buffer=None, consider_context=False, document_id=None,
+                 schema_id=None, chunk_size=65536, write_buffer_size=0,
+                 write_buffer_timeout=None, compression=None):
+        self.compression = compression
+        self.write_buffer_size = write_buffer_size
+        self.write_buffer_timeout = write_buffer_timeout
+        self.buffer = buffer
+        self.chunk_size = chunk_size
+        self.consider_context = consider_context
+        self.document_id = document_id
+        self.schema_id = schema_id
+        self._cached_validation_signature = None
+
+        self.errors = ErrorList()
+
+    def __bytes__(self):
+        return self()
+
+    def __call__(self, errors=None):
+        if isinstance(errors, Validator):
+            errors = errors._errors
+        elif errors is None:
+            errors = self.errors
+
+        encoder = ErrorRecordEncoder()
+        records = [make_record(STREAM, STREAM_MAGIC)]
+        signature = self._validation_signature
+        if signature:
+            records.append(self._signature_record(signature))
+        records.extend(encoder.encode(x) for x in errors)
+        return b''.join(records)
+
+    def __iter__(self):
+        if self._buffer is None:
+            raise RuntimeError("{} must have a 'buffer'-property set.".format(repr(self)))
+
+        elif self._buffer_type is IOBase:
+            self.__errors = self._iter_errors(self._buffer.read, **self._parse_args)
+        elif self._buffer_type is socket:
+            self.__errors = self._iter_errors(self._buffer.recv, **self._parse_args)
+
+        return self
+
+    def __next__(self):
+        return self._next_from_buffer()
+
+    def add(self, error):
+        self.errors.append(error)
+
+    def clear(self):
+        """ Clears collected errors. """
+        self.errors = ErrorList()
+
+    def end(self, validator):
+        if self._buffer_type is None:
+            return
+
+        self._session.leave(self)
+        self._cached_validation_signature = None
+
+    def emit(self, error):
+        if self._buffer_type is None:
+            return
+
+        session = self._session
+        with session.lock:
+            records = session.shared['encoder'].encode(error)
+            if session.shared['signature'] != self._cached_validation_signature:
+                session.shared['signature'] = self._cached_validation_signature
+                records = self._signature_record(self._cached_validation_signature) + records
+            session.write(self, records)
+
+    def extend(self, errors):
+        self.errors.extend(errors)
+
+    def _next_from_file(self):
+        return next(self.__errors)
+
+    _next_from_socket = _next_from_file
+
+    def _iter_errors(self, read, document_id=None, schema_id=None, validate_signature=True):
+        scanner, decoder = RecordScanner(), ErrorRecordDecoder()
+        for chunk in self._iter_chunks(read):
+            for kind, payload in scanner.feed(chunk):
+                error = decoder.decode(kind, payload)
+                if error is not None:
+                    yield error
+                elif kind == SIGNATURE and validate_signature:
+                    self._validate_signature(decoder.signature, document_id, schema_id)
+
+    def parse(self, data, document_id=None, schema_id=None, validate_signature=None):
+        """ Parses a binary error stream to cerberus error representations.
+
+            :param data: The encoded errors.
+            :type data: bytes
+            :param document_id: Errors' ``document_id`` attributes must match
+                                this one.
+            :type document_id: str
+            :param schema_id: Errors' ``schema_id`` attributes must match this
+                              one.
+            :type schema_id: str
+            :param validate_signature: Controls whether to check validation
+                   signature, defaults to :attr:`consider_context`.
+            :type validate_signature: bool
+            :returns: The parsed errors.
+            :rtype: :class:`~cerberus.errors.ErrorList`
+        """
+        if validate_signature is None:
+            validate_signature = self.consider_context
+        chunks = iter((data, b''))
+        return ErrorList(self._iter_errors(lambda size: next(chunks), document_id,
+                                           schema_id, validate_signature))
+
+    def read(self, buffer=None, **parse_args):
+        """ Reads from a buffer and returns the parsed cerberus error
+            representations.
+
+            :param buffer: The buffer to read from, :attr:`buffer` is used if
+                           :obj:`None` is provided.
+            :type buffer: :class:`io.BufferedIOBase` (like files opened in
+                          binary mode) or :class:`socket.socket`
+            :param parse_args: See :meth:`~cerberus_collections.BinaryErrorHandler.parse`'s
+                                    keyword arguments.
+            :returns: A list of :class:`~cerberus.errors.ValidationError`
+                      instances.
+        """
+        buffer = buffer or self.buffer
+        _parse_args = self._parse_args.copy()
+        _parse_args.update(parse_args)
+
+        if isinstance(buffer, IOBase):
+            return ErrorList(self._iter_errors(buffer.read, **_parse_args))
+        elif isinstance(buffer, socket):
+            return ErrorList(self._iter_errors(buffer.recv, **_parse_args))
+        else:
+            raise RuntimeError("Can't read from object %s" % repr(buffer))
+
+    def start(self, validator):
+        if self._buffer_type is None:
+            return
+        if isinstance(self._buffer, TextIOBase):
+            raise TypeError('Binary errors can only be written to binary buffers.')
+
+        self._cached_validation_signature = self._validation_signature
+        session = EmissionSession.join(self, make_record(STREAM, STREAM_MAGIC))
+        with session.lock:
+            if 'encoder' not in session.shared:
+                session.shared.update(encoder=ErrorRecordEncoder(), signature={})
+
+    @staticmethod
+    def _signature_record(signature):
+        payload = bytearray()
+        encode_value(payload, signature)
+        return make_record(SIGNATURE, bytes(payload))
@@ -0,0 +1,93 @@
+from importlib import import_module
+import lzma
+import zlib
+
+
+class LZ4FrameCompressor:
+    """ Adapts :class:`lz4.frame.LZ4FrameCompressor` to the interface of
+        the standard library's compressors. """
+    def __init__(self):
+        self._compressor = import_module('lz4.frame').LZ4FrameCompressor()
+        self._header = self._compressor.begin()
+
+    def compress(self, data):
+        header, self._header = self._header, b''
+        return header + self._compressor.compress(data)
+
+    def flush(self):
+        header, self._header = self._header, b''
+        return header + self._compressor.flush()
+
+
+def _gzip_compressor():
+    return zlib.compressobj(wbits=31)
+
+
+def _gzip_decompressor():
+    return zlib.decompressobj(wbits=31)
+
+
+def _lz4_decompressor():
+    return import_module('lz4.frame').LZ4FrameDecompressor()
+
+
+def _zstd_compressor():
+    return import_module('zstandard').ZstdCompressor().compressobj()
+
+
+def _zstd_decompressor():
+    return import_module('zstandard').ZstdDecompressor().decompressobj()
+
+
+# compression names are mapped to the distribution they require and
+# factories of streaming compressors and decompressors
+codecs = {
+    'gzip': (None, _gzip_compressor, _gzip_decompressor),
+    'lz4': ('lz4', LZ4FrameCompressor, _lz4_decompressor),
+    'lzma': (None, lzma.LZMACompressor, lzma.LZMADecompressor),
+    'zstd': ('zstandard', _zstd_compressor, _zstd_decompressor),
+}
+
+
+def get_codec(compression):
+    """ Looks up the factories of a compression's streaming compressor and
+        decompressor.
+
+        :param compression: ``gzip``, ``lz4``, ``lzma`` or ``zstd``.
+        :type compression: str
+        :returns: A two-value tuple with the compressor and the decompressor
+                  factory.
+        :raises ValueError: If the compression is unknown.
+        :raises ImportError: If the required distribution is not installed.
+    """
+    try:
+        requirement, compressor, decompressor = codecs[compression]
+    except KeyError:
+        raise ValueError('Unsupported compression: {}'.format(compression))
+    if requirement is not None:
+        import_module(requirement)
+    return compressor, decompressor
+
+
+class StreamDecompressor:
+    """ Decompresses consecutive chunks of a stream that may consist of
+        several concatenated compressed streams, as written by successive
+        validations to the same file.
+
+        :param factory: A callable that returns a decompressor.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self._decompressor = factory()
+
+    def decompress(self, data):
+        """ Returns the decompressed data that is available after consuming
+            ``data``, which may be empty. """
+        result = []
+        while data:
+            result.append(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                break
+            data = self._decompressor.unused_data
+            self._decompressor = self.factory()
+        return b''.join(result)
@@ -0,0 +1,116 @@
+from hashlib import sha1
+from io import UnsupportedOperation
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from struct import Struct
+
+
+# an entry consists of the digests of the document_id, the schema_id and the
+# first item of the document_path, and the offset and length of the record
+entry = Struct('>8s8s8sQI')
+
+
+def key_digest(value):
+    """ Returns a stable digest of an identifier's representation. """
+    return sha1(repr(value).encode()).digest()[:8]
+
+
+def _path_digest(document_path):
+    return key_digest(document_path[0] if document_path else None)
+
+
+class IndexWriter:
+    """ Appends entries to a sidecar index.
+
+        :param target: A path or a file opened in binary mode.
+    """
+    def __init__(self, target):
+        if isinstance(target, str):
+            self.file = open(target, 'ab')
+            self._owned = True
+        else:
+            self.file = target
+            self._owned = False
+
+    def add(self, document_id, schema_id, document_path, offset, length):
+        """ Adds an entry for a record. """
+        self.file.write(entry.pack(key_digest(document_id), key_digest(schema_id),
+                                   _path_digest(document_path), offset, length))
+
+    def close(self):
+        """ Flushes the written entries and closes the file if it was opened
+            from a path. """
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class ErrorIndex:
+    """ Looks up records in a sidecar index. Files are memory-mapped, so the
+        index isn't copied into memory and lookups scan it with
+        :meth:`mmap.mmap.find`.
+
+        :param source: A path or a file opened in binary mode.
+    """
+    def __init__(self, source):
+        self._file = open(source, 'rb') if isinstance(source, str) else None
+        self.data = self._map(self._file or source)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _map(source):
+        try:
+            fileno = source.fileno()
+        except (AttributeError, UnsupportedOperation):
+            source.seek(0)
+            return source.read()
+        if not fstat(fileno).st_size:
+            return b''
+        return mmap(fileno, 0, access=ACCESS_READ)
+
+    def close(self):
+        if isinstance(self.data, mmap):
+            self.data.close()
+        if self._file is not None:
+            self._file.close()
+
+    def lookup(self, document_id=None, schema_id=None, document_path=None):
+        """ Returns the spans of the records that match all given criteria in
+            the order they were written.
+
+            :param document_id: The ``document_id`` of the emitting handler.
+            :param schema_id: The ``schema_id`` of the emitting handler.
+            :param document_path: A document path whose first item must match
+                                  the first item of the errors' paths.
+            :type document_path: tuple
+            :returns: A list of two-value tuples with offsets and lengths.
+        """
+        criteria = [(i, digest) for i, digest in enumerate((
+            None if document_id is None else key_digest(document_id),
+            None if schema_id is None else key_digest(schema_id),
+            None if document_path is None else _path_digest(document_path)
+        )) if digest is not None]
+
+        if not criteria:
+            return [x[3:] for x in entry.iter_unpack(self.data)]
+
+        result = []
+        field, digest = criteria[0]
+        field_offset, data = field * len(digest), self.data
+        position = data.find(digest, field_offset)
+        while position != -1:
+            start = position - field_offset
+            if start % entry.size:
+                position = data.find(digest, position + 1)
+                continue
+            values = entry.unpack_from(data, start)
+            if all(values[i] == x for i, x in criteria[1:]):
+                result.append(values[3:])
+            position = data.find(digest, start + entry.size + field_offset)
+        return result
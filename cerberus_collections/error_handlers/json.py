@@ -1,17 +1,89 @@
+from datetime import date, datetime
+from codecs import lookup
+from functools import lru_cache
+from importlib import import_module
 from io import IOBase
 import json
+from json.encoder import encode_basestring_ascii
+import re
 from socket import socket
 
 from cerberus import Validator
 from cerberus.errors import BaseErrorHandler, ErrorList
 
-from cerberus_collections.error_handlers.mixins import BufferAdapter, ValidationContext
-from cerberus_collections.utils import error_as_dict, error_from_dict
+from cerberus_collections.error_handlers.exceptions import DecodingError
+from cerberus_collections.error_handlers.mixins import \
+    BufferAdapter, EmissionSession, ValidationContext
+from cerberus_collections.utils import \
+    PathCache, base64_to_bytes, binary_to_base64, date_from_isoformat, \
+    datetime_from_isoformat, error_from_dict
+
+
+# types that json doesn't support are encoded as mappings with one of these keys
+typed_value_encoders = {
+    bytearray: ('__bytearray__', binary_to_base64),
+    bytes: ('__bytes__', binary_to_base64),
+    date: ('__date__', date.isoformat),
+    datetime: ('__datetime__', datetime.isoformat),
+    frozenset: ('__frozenset__', list),
+    set: ('__set__', list),
+    tuple: ('__tuple__', list),
+}
+
+typed_value_decoders = {
+    '__bytearray__': lambda x: bytearray(base64_to_bytes(x)),
+    '__bytes__': base64_to_bytes,
+    '__date__': date_from_isoformat,
+    '__datetime__': datetime_from_isoformat,
+    '__dict__': dict,
+    '__frozenset__': frozenset,
+    '__set__': set,
+    '__tuple__': tuple,
+}
+
+
+@lru_cache(maxsize=256)
+def typed_value_encoding(value_type):
+    """ Resolves how values of a type are encoded as typed values along its
+        method resolution order, so that subclasses are encoded like their
+        bases.
+
+        :returns: :class:`list` or :class:`dict` for values that are encoded
+                  as arrays or mappings, a tag and an encoder from
+                  :data:`typed_value_encoders` or :obj:`None` if the value is
+                  encoded as is.
+    """
+    for base in value_type.__mro__:
+        if base is list or base is dict:
+            return base
+        elif base in typed_value_encoders:
+            return typed_value_encoders[base]
+    return None
+
+
+def decode_typed_value(mapping):
+    """ Decodes a mapping that represents a typed value. Intended to be
+        used as ``object_hook`` for :func:`json.loads`.
+
+        :returns: The decoded value or the unchanged mapping.
+    """
+    if len(mapping) == 1:
+        tag, value = next(iter(mapping.items()))
+        decoder = typed_value_decoders.get(tag)
+        if decoder is not None:
+            try:
+                return decoder(value)
+            except (TypeError, ValueError):
+                raise DecodingError(tag.strip('_'), value)
+    return mapping
 
 
 def extract_mapping_from_json_chunk(s):
     """ Tries to extract a mapping from an arbitrary sized json chunk.
 
+        As it rescans the whole chunk on every call, prefer
+        :class:`JSONMappingScanner` to process streams.
+
         :returns: A two-value tuple with the extracted mapping string or
                   :obj:`None` and remaining part of the chunk.
         :rtype: str
@@ -39,6 +111,407 @@ def extract_mapping_from_json_chunk(s):
     return s[:i+1], s[i+2:].lstrip()
 
 
+leading_patterns = {str: re.compile(r'\S'), bytes: re.compile(rb'\S')}
+
+
+def leading_character(data):
+    """ Returns the first character of json data that isn't whitespace.
+
+        :param data: The data, bytes-like objects aren't copied.
+        :type data: str or a :term:`bytes-like object`
+        :rtype: str
+    """
+    match = leading_patterns[str if isinstance(data, str) else bytes].search(data)
+    if match is None:
+        return ''
+    character = match.group()
+    return character if isinstance(character, str) else character.decode('latin-1')
+
+
+class JSONMappingScanner:
+    """ A resumable scanner that extracts complete top-level mappings from
+        consecutive chunks of a json-encoded array of mappings.
+
+        The scanner keeps its quoting, escaping and nesting state between
+        calls to :meth:`feed`, so every character is inspected only once and
+        only the part of the stream that belongs to an incomplete mapping is
+        held in memory. Chunks may be :class:`str` or :class:`bytes`, but all
+        chunks fed to one instance must be of the same type.
+
+        :param level: The nesting level of the extracted mappings, ``2`` to
+                      extract the mappings that are nested in top-level
+                      mappings as in an array of envelopes.
+        :type level: int
+    """
+    _patterns = {
+        str: (re.compile(r'(")|(\{)|(\})'), re.compile(r'(")|(\\)')),
+        bytes: (re.compile(rb'(")|(\{)|(\})'), re.compile(rb'(")|(\\)'))
+    }
+
+    def __init__(self, level=1):
+        self.level = level
+        self.depth = 0
+        self.escaped = self.quoted = False
+        self._pending = []
+
+    def feed(self, chunk):
+        """ Consumes a chunk and returns the mappings that were completed
+            with it.
+
+            :param chunk: The next part of the stream.
+            :type chunk: :class:`str` or :class:`bytes`
+            :returns: A list of json-encoded mappings.
+        """
+        structure_pattern, string_pattern = \
+            self._patterns[str if isinstance(chunk, str) else bytes]
+        result = []
+        end = len(chunk)
+        position = 0
+        self._start = 0 if self.depth >= self.level else None
+
+        if self.escaped and end:
+            self.escaped = False
+            position = 1
+
+        while position < end:
+            if self.quoted:
+                position = self._skip_string(chunk, position, string_pattern)
+            else:
+                position = self._scan_structure(chunk, position, structure_pattern, result)
+
+        if self._start is not None:
+            self._pending.append(chunk[self._start:])
+
+        return result
+
+    def _scan_structure(self, chunk, position, pattern, result):
+        match = pattern.search(chunk, position)
+        if match is None:
+            return len(chunk)
+
+        position = match.end()
+        if match.lastindex == 1:
+            self.quoted = True
+        elif match.lastindex == 2:
+            if self.depth == self.level - 1:
+                self._start = match.start()
+            self.depth += 1
+        elif self.depth:
+            self.depth -= 1
+            if self.depth == self.level - 1 and self._start is not None:
+                self._pending.append(chunk[self._start:position])
+                result.append(chunk[:0].join(self._pending))
+                self._pending = []
+                self._start = None
+        return position
+
+    def _skip_string(self, chunk, position, pattern):
+        match = pattern.search(chunk, position)
+        if match is None:
+            return len(chunk)
+
+        position = match.end()
+        if match.lastindex == 1:
+            self.quoted = False
+        elif position == len(chunk):
+            self.escaped = True
+        else:
+            position += 1
+        return position
+
+
+class JSONLinesScanner:
+    """ Extracts complete lines from consecutive chunks of newline-delimited
+        json. Only the part of the stream that belongs to an incomplete line
+        is held in memory. Chunks may be :class:`str` or :class:`bytes`, but
+        all chunks fed to one instance must be of the same type.
+    """
+    def __init__(self):
+        self._pending = []
+
+    def feed(self, chunk):
+        """ Consumes a chunk and returns the lines that were completed with
+            it.
+
+            :param chunk: The next part of the stream.
+            :type chunk: :class:`str` or :class:`bytes`
+            :returns: A list of json-encoded mappings.
+        """
+        lines = chunk.split('\n' if isinstance(chunk, str) else b'\n')
+        if len(lines) == 1:
+            self._pending.append(chunk)
+            return []
+
+        self._pending.append(lines[0])
+        lines[0] = chunk[:0].join(self._pending)
+        self._pending = [lines.pop()]
+        return [x for x in lines if x.strip()]
+
+    def flush(self):
+        """ Returns the last line if the stream didn't end with a line
+            break. """
+        pending, self._pending = self._pending, []
+        line = pending[0][:0].join(pending) if pending else ''
+        return [line] if line.strip() else []
+
+
+non_ascii_pattern = re.compile(r'[^\x00-\x7f]+')
+
+
+def _escape_non_ascii(match):
+    return encode_basestring_ascii(match.group())[1:-1]
+
+
+class ErrorEncoder:
+    """ Serializes validation errors to json without building intermediate
+        mappings.
+
+        With the ``json`` backend the result is identical to what
+        :func:`json.dumps` produces for the errors' representations as
+        :func:`~cerberus_collections.utils.error_as_dict` returns them. The
+        other backends are only used for compact output without indentation.
+        Their output is also ASCII-only, but it isn't guaranteed to be
+        identical, as they may represent floats differently. Values that a
+        backend can't encode, like integers that exceed 64 bits, are encoded
+        with :mod:`json`.
+
+        :param indent: Block indentation as :func:`json.dumps` takes it.
+        :param separators: Item and key separators as :func:`json.dumps`
+                           takes them.
+        :param signature: A validation signature that is added to top-level
+                          errors.
+        :type signature: dict
+        :param backend: The name of the library that is used to encode values,
+                        ``json``, ``orjson`` or ``ujson``. If it's not
+                        available, ``json`` is used.
+        :type backend: str
+        :param typed_values: Encode values of types that json doesn't
+                             support and dictionaries with non-string keys
+                             as tagged mappings that
+                             :func:`decode_typed_value` restores.
+        :type typed_values: bool
+    """
+    fields = ('code', 'constraint', 'document_path', 'field', 'rule', 'schema_path', 'value')
+
+    def __init__(self, indent=None, separators=None, signature=None, backend='json',
+                 typed_values=False):
+        if separators is None:
+            separators = (', ', ': ') if indent is None else (',', ': ')
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+        self.indent = indent
+        self.item_separator, self.key_separator = separators
+        self.signature = signature or {}
+
+        self._container_encoder = json.JSONEncoder(indent=indent, separators=separators).encode
+        if backend != 'json' and indent is None and separators == (',', ':'):
+            self._container_encoder = \
+                self._get_backend_encoder(backend, self._container_encoder) \
+                or self._container_encoder
+        self._newlines = []
+        self._signature_fragments = {}
+        if typed_values:
+            self._encode_value = self._encode_typed_value
+            self._encode_sequence = self._encode_typed_array
+        else:
+            self._encode_sequence = self._encode_value
+
+    def _get_backend_encoder(self, backend, fallback):
+        try:
+            module = import_module(backend)
+        except ImportError:
+            return None
+        if backend == 'orjson':
+            option = module.OPT_NON_STR_KEYS
+
+            def encode(value):
+                return non_ascii_pattern.sub(_escape_non_ascii,
+                                             module.dumps(value, option=option).decode())
+        elif backend == 'ujson':
+            def encode(value):
+                return module.dumps(value, ensure_ascii=True, escape_forward_slashes=False)
+        else:
+            raise ValueError('Unsupported json backend: {}'.format(backend))
+
+        def encoder(value):
+            try:
+                return encode(value)
+            except (OverflowError, TypeError):
+                return fallback(value)
+        return encoder
+
+    def _newline(self, level):
+        """ Returns the line break and indentation for a nesting level. """
+        try:
+            return self._newlines[level]
+        except IndexError:
+            for i in range(len(self._newlines), level + 1):
+                self._newlines.append('' if self.indent is None else '\n' + self.indent * i)
+            return self._newlines[level]
+
+    def encode(self, error, level=0):
+        """ Returns the json representation of a top-level error.
+
+            :param error: The error to encode.
+            :type error: :class:`~cerberus.errors.ValidationError`
+            :param level: The nesting level that is considered for
+                          indentation.
+            :type level: int
+            :rtype: str
+        """
+        parts = []
+        self._encode_error(error, level, parts, top_level=True)
+        return ''.join(parts)
+
+    def encode_list(self, errors):
+        """ Returns the json representation of a list of top-level errors.
+
+            :param errors: The errors to encode.
+            :rtype: str
+        """
+        parts = []
+        self._encode_errors(errors, 0, parts, top_level=True)
+        return ''.join(parts)
+
+    def _encode_value(self, value, level):
+        value_type = type(value)
+        if value_type is str:
+            return encode_basestring_ascii(value)
+        elif value is None:
+            return 'null'
+        elif value_type is bool:
+            return 'true' if value else 'false'
+        elif value_type is int:
+            return int.__repr__(value)
+        elif value_type is tuple or value_type is list:
+            result = self._encode_flat_sequence(value, level)
+            if result is not None:
+                return result
+
+        result = self._container_encoder(value)
+        if self.indent and level and '\n' in result:
+            result = result.replace('\n', self._newline(level))
+        return result
+
+    def _encode_typed_value(self, value, level):
+        encoding = typed_value_encoding(type(value))
+        if encoding is None:
+            return ErrorEncoder._encode_value(self, value, level)
+        elif encoding is list:
+            return self._encode_typed_array(value, level)
+        elif encoding is dict:
+            return self._encode_typed_mapping(value, level)
+        else:
+            tag, encoder = encoding
+            encoded_value = self._encode_typed_value(encoder(value), level + 1)
+            return self._encode_object(((tag, encoded_value),), level)
+
+    def _encode_typed_array(self, sequence, level):
+        if not sequence:
+            return '[]'
+        newline = self._newline(level + 1)
+        return '[' + newline + (self.item_separator + newline).join(
+            self._encode_typed_value(x, level + 1) for x in sequence) + self._newline(level) + ']'
+
+    def _encode_typed_mapping(self, mapping, level):
+        if all(type(x) is str for x in mapping) and \
+                not (len(mapping) == 1 and next(iter(mapping)) in typed_value_decoders):
+            return self._encode_object(
+                ((k, self._encode_typed_value(v, level + 1)) for k, v in mapping.items()), level)
+        else:
+            return self._encode_object(
+                (('__dict__', self._encode_typed_array([[k, v] for k, v in mapping.items()],
+                                                       level + 1)),),
+                level)
+
+    def _encode_object(self, encoded_items, level):
+        newline = self._newline(level + 1)
+        result = (self.item_separator + newline).join(
+            encode_basestring_ascii(k) + self.key_separator + v for k, v in encoded_items)
+        if not result:
+            return '{}'
+        return '{' + newline + result + self._newline(level) + '}'
+
+    def _encode_flat_sequence(self, sequence, level):
+        # most paths and many constraints only contain strings and integers
+        if not sequence:
+            return '[]'
+        items = []
+        for item in sequence:
+            if type(item) is str:
+                items.append(encode_basestring_ascii(item))
+            elif type(item) is int:
+                items.append(int.__repr__(item))
+            else:
+                return None
+        separator = self.item_separator + self._newline(level + 1)
+        return '[' + self._newline(level + 1) + separator.join(items) + self._newline(level) + ']'
+
+    def _encode_error(self, error, level, parts, top_level=False):
+        encode_value = self._encode_value
+        inner_level = level + 1
+        newline = self._newline(inner_level)
+        separator = self.item_separator + newline
+        key_separator = self.key_separator
+
+        parts.extend((
+            '{', newline, '"code"', key_separator, int.__repr__(error.code),
+            separator, '"constraint"', key_separator, encode_value(error.constraint, inner_level),
+            separator, '"document_path"', key_separator,
+            self._encode_sequence(error.document_path, inner_level),
+            separator, '"field"', key_separator, encode_value(error.field, inner_level),
+            separator, '"rule"', key_separator, encode_value(error.rule, inner_level),
+            separator, '"schema_path"', key_separator,
+            self._encode_sequence(error.schema_path, inner_level),
+            separator, '"value"', key_separator, encode_value(error.value, inner_level),
+            separator, '"info"', key_separator
+        ))
+
+        if error.is_group_error:
+            self._encode_group_info(error.info, inner_level, parts)
+        else:
+            parts.append(self._encode_sequence(error.info, inner_level))
+
+        if top_level and self.signature:
+            parts.append(self._signature_fragment(level))
+        parts.append(self._newline(level))
+        parts.append('}')
+
+    def _encode_errors(self, errors, level, parts, top_level=False):
+        if not errors:
+            parts.append('[]')
+            return
+        separator = self._newline(level + 1)
+        parts.append('[')
+        for error in errors:
+            parts.append(separator)
+            self._encode_error(error, level + 1, parts, top_level)
+            separator = self.item_separator + self._newline(level + 1)
+        parts.append(self._newline(level))
+        parts.append(']')
+
+    def _encode_group_info(self, info, level, parts):
+        separator = self.item_separator + self._newline(level + 1)
+        parts.append('[')
+        parts.append(self._newline(level + 1))
+        self._encode_errors(info[0], level + 1, parts)
+        for value in info[1:]:
+            parts.append(separator)
+            parts.append(self._encode_value(value, level + 1))
+        parts.append(self._newline(level))
+        parts.append(']')
+
+    def _signature_fragment(self, level):
+        fragment = self._signature_fragments.get(level)
+        if fragment is None:
+            separator = self.item_separator + self._newline(level + 1)
+            fragment = ''.join(separator + encode_basestring_ascii(k) + self.key_separator +
+                               self._encode_value(v, level + 1)
+                               for k, v in self.signature.items())
+            self._signature_fragments[level] = fragment
+        return fragment
+
+
 class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
     """ An error handler that (de-)serializes cerberus validation errors to and
         from JSON.
@@ -78,11 +551,70 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         :type document_id: str
         :param schema_id: An identifier that refers the used validation schema.
         :type schema_id: str
+        :param chunk_size: The amount of data that is read at once from a
+                           ``buffer`` while iterating.
+        :type chunk_size: int
+        :param write_buffer_size: Coalesce emitted data and write it to the
+                                  ``buffer`` once this many bytes are
+                                  collected or the validation ends.
+                                  ``0`` writes every fragment immediately.
+        :type write_buffer_size: int
+        :param write_buffer_timeout: Also write coalesced data when this many
+                                     seconds have passed since the last write.
+        :type write_buffer_timeout: float or :obj:`None`
+        :param backend: The library that encodes json when ``compact`` is set
+                        and ``indent`` is :obj:`None`, ``json``, ``orjson`` or
+                        ``ujson``. See :class:`ErrorEncoder`.
+        :type backend: str
+        :param typed_values: Preserve values of types that json doesn't
+                             support like :class:`bytes`, :class:`set`,
+                             :class:`tuple` or :class:`datetime.datetime` and
+                             dictionaries with non-string keys. Reading
+                             handlers must use the same setting.
+        :type typed_values: bool
+        :param compression: Compress emitted data and decompress data that is
+                            read from a ``buffer`` with ``gzip``, ``lzma``,
+                            ``zstd`` (requires ``zstandard``) or ``lz4``.
+                            Files must be opened in binary mode.
+        :type compression: str or :obj:`None`
+        :param format: ``json`` to write an array of errors, ``jsonl`` to
+                       write one error per line without any further framing.
+                       ``indent`` is ignored for the latter.
+        :type format: str
+        :param index: Write a sidecar index that refers the emitted errors by
+                      the handler's ``document_id`` and ``schema_id`` and
+                      their document paths' first item to this path or file.
+                      It's appended to and used by :meth:`read_for`. The
+                      ``buffer`` must be a file that is opened in binary mode.
+        :type index: str or :class:`io.BufferedIOBase`
+        :param envelope: Write an array of envelopes that hold the validation
+                         signature once and the errors it applies to instead
+                         of adding the signature to every error. A new
+                         envelope is started when the signature of emitted
+                         errors changes. Only supported with the ``json``
+                         format, reading handlers must use the same setting.
+        :type envelope: bool
         """
     def __init__(self, buffer=None, compact=True, indent=-1,
                  encoding='utf-8', consider_context=False,
-                 document_id=None, schema_id=None):
+                 document_id=None, schema_id=None, chunk_size=65536,
+                 write_buffer_size=0, write_buffer_timeout=None, backend='json',
+                 typed_values=False, compression=None, format='json', index=None,
+                 envelope=False):
+        if format not in ('json', 'jsonl'):
+            raise ValueError('Unsupported format: {}'.format(format))
+        if envelope and format != 'json':
+            raise ValueError("Envelopes are only supported with the 'json' format.")
+        self.format = format
+        self.envelope = envelope
+        self.compression = compression
+        self.index = index
+        self.backend = backend
+        self.typed_values = typed_values
+        self.write_buffer_size = write_buffer_size
+        self.write_buffer_timeout = write_buffer_timeout
         self.buffer = buffer
+        self.chunk_size = chunk_size
         self.compact = compact
         self.indent = indent
         self.encoding = encoding
@@ -90,6 +622,7 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         self.document_id = document_id
         self.schema_id = schema_id
         self._cached_validation_signature = None
+        self._path_cache = PathCache()
 
         self.errors = ErrorList()
 
@@ -99,23 +632,24 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         elif errors is None:
             errors = self.errors
 
-        errors = [error_as_dict(x) for x in errors]
-        if self._validation_signature:
-            for error in errors:
-                error.update(self._validation_signature)
-        return json.dumps(errors, **self._dump_kwargs)
+        if self.envelope:
+            encoder = self._error_encoder(None)
+            return '[' + self._envelope_opening(encoder, self._validation_signature) + \
+                encoder.encode_list(errors) + '}]'
+
+        encoder = self._error_encoder(self._validation_signature)
+        if self.format == 'jsonl':
+            return ''.join(encoder.encode(x) + '\n' for x in errors)
+        return encoder.encode_list(errors)
 
     def __iter__(self):
         if self._buffer is None:
             raise RuntimeError("{} must have a 'buffer'-property set.".format(repr(self)))
 
         elif self._buffer_type is IOBase:
-            self.__errors = json.load(self._buffer)
+            self.__mappings = self._iter_mappings(self._buffer.read)
         elif self._buffer_type is socket:
-            buffer = self._buffer.recv(1024).decode(self.encoding)
-            if buffer.startswith('['):
-                buffer = buffer[1:]
-            self.__socketbuffer = buffer
+            self.__mappings = self._iter_mappings(self._buffer.recv)
 
         return self
 
@@ -127,9 +661,22 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
 
     @property
     def _dump_kwargs(self):
-        return {'indent': self.indent,
+        return {'indent': None if self.format == 'jsonl' else self.indent,
                 'separators': (',', ':') if self.compact else None}
 
+    def _error_encoder(self, signature):
+        return ErrorEncoder(signature=signature, backend=self.backend,
+                            typed_values=self.typed_values, **self._dump_kwargs)
+
+    @staticmethod
+    def _envelope_opening(encoder, signature):
+        """ Returns an envelope's json up to the value of its errors. """
+        return '{"signature"' + encoder.key_separator + encoder._encode_value(signature, 1) + \
+            encoder.item_separator + '"errors"' + encoder.key_separator
+
+    def _loads(self, _json):
+        return json.loads(_json, object_hook=decode_typed_value if self.typed_values else None)
+
     def add(self, error):
         self.errors.append(error)
 
@@ -141,68 +688,83 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         if self._buffer_type is None:
             return
 
-        self._write_to_buffer(self.__next_error_to_dump)
-
-        self.used_emit_buffers[id(self._buffer)] -= 1
-        if self.used_emit_buffers[id(self._buffer)]:
-            self._write_to_buffer(',')
+        if self.envelope:
+            self._session.leave(self, self._envelope_closing)
         else:
-            self._write_to_buffer(']')
+            self._session.leave(self, '' if self.format == 'jsonl' else ']')
         self._cached_validation_signature = None
 
     def emit(self, error):
         if self._buffer_type is None:
             return
 
-        if self.__next_error_to_dump:
-            self._write_to_buffer(self.__next_error_to_dump + ',')
-
-        error = error_as_dict(error)
-        if self.consider_context:
-            error.update(self._cached_validation_signature)
-        self.__next_error_to_dump = json.dumps(error, **self._dump_kwargs)
+        if self.format == 'jsonl':
+            self._session.write(self, self.__emit_encoder.encode(error) + '\n', error=error)
+        elif self.envelope:
+            self._emit_to_envelope(error)
+        else:
+            self._session.write(self, self.__emit_encoder.encode(error), separator=',',
+                                error=error)
+
+    def _emit_to_envelope(self, error):
+        session, signature = self._session, self._cached_validation_signature
+        with session.lock:
+            envelope = session.shared.get('envelope')
+            if envelope is None or envelope != signature:
+                session.write(self, self._envelope_opening(self.__emit_encoder, signature) + '[',
+                              separator=']},')
+                session.shared['envelope'] = signature
+                session.write(self, self.__emit_encoder.encode(error), error=error)
+            else:
+                session.write(self, self.__emit_encoder.encode(error), separator=',',
+                              error=error)
+
+    def _envelope_closing(self):
+        return ']}]' if 'envelope' in self._session.shared else ']'
 
     def extend(self, errors):
         self.errors.extend(errors)
 
-    def _next_from_file(self):
-        # TODO read file in chunks
-        if self.__errors:
-            error = self.__errors.pop()
-            if self.consider_context:
-                identifiers = self._pop_validation_signature(error)
-                self._validate_signature(identifiers)
-            return error_from_dict(error)
+    def _iter_mappings(self, read):
+        if self.format == 'jsonl':
+            scanner = JSONLinesScanner()
         else:
-            raise StopIteration
-
-    def _next_from_socket(self):
-        buffer = self.__socketbuffer
+            scanner = JSONMappingScanner(level=2 if self.envelope else 1)
+        for chunk in self._iter_chunks(read):
+            yield from scanner.feed(chunk)
+        if self.format == 'jsonl':
+            yield from scanner.flush()
 
-        if buffer == ']':
-            raise StopIteration
-
-        while True:
-            buffer += self._buffer.recv(1024).decode(self.encoding)
-            if not buffer:
-                error_string = None
-                break
-
-            error_string, buffer = extract_mapping_from_json_chunk(buffer)
-            if error_string is not None:
-                break
-
-        if error_string is None:
-            raise StopIteration
-
-        self.__socketbuffer = buffer
-        return error_from_dict(json.loads(error_string))
+    def _next_from_file(self):
+        error = None
+        while error is None:
+            error = self._error_from_mapping(next(self.__mappings))
+        return error
+
+    _next_from_socket = _next_from_file
+
+    def _parse_record(self, data):
+        return self._error_from_mapping(data)
+
+    def _error_from_mapping(self, mapping):
+        if isinstance(mapping, bytes):
+            mapping = mapping.decode(self.encoding)
+        error = self._loads(mapping)
+        if self.envelope and 'code' not in error:
+            # an envelope's signature precedes the errors it applies to
+            if self.consider_context:
+                self._validate_signature(self._pop_validation_signature(error))
+            return None
+        if self.consider_context and not self.envelope:
+            identifiers = self._pop_validation_signature(error)
+            self._validate_signature(identifiers)
+        return error_from_dict(error, self._path_cache)
 
     def parse(self, _json, **parse_args):
         """ Parses JSON to cerberus error representations.
 
         :param _json: json-encoded error representation error or a list of these.
-        :type _json: str
+        :type _json: str or a :term:`bytes-like object`
         :param document_id: Errors' ``document_id`` attributes must match
                             this one.
         :type document_id: str
@@ -215,31 +777,53 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         :returns: The parsed error or errors.
         :rtype: A :class:`~cerberus.errors.ValidationError` instance if an
                 encoded mapping was provided, or a list of these in case
-                of a list.
+                of a list or if :attr:`format` is ``jsonl``.
         """
         validate_signature = parse_args.pop('validate_signature',
                                             self.consider_context)
 
-        if isinstance(_json, bytes):
-            _json = _json.decode(self.encoding)
-        _json = _json.strip()
-
-        if _json.startswith('{'):
-            error = json.loads(_json)
+        # json.loads decodes utf-8 encoded bytes and bytearrays itself, so
+        # these aren't copied here for the common cases
+        if not isinstance(_json, str) and (
+                isinstance(_json, memoryview) or self.format == 'jsonl' or
+                lookup(self.encoding).name != 'utf-8'):
+            _json = str(_json, self.encoding)
+        leading = leading_character(_json)
+
+        if self.envelope:
+            return ErrorList(self._errors_from_envelopes(self._loads(_json), validate_signature,
+                                                         parse_args))
+        elif self.format == 'jsonl':
+            # str.splitlines would also split at characters like U+2028 that
+            # may occur unescaped in records
+            errors = [self._loads(x) for x in _json.split('\n') if x.strip()]
+        elif leading == '{':
+            error = self._loads(_json)
             if validate_signature:
                 identifiers = self._pop_validation_signature(error)
                 self._validate_signature(identifiers, **parse_args)
-            return error_from_dict(error)
-        elif _json.startswith('['):
-            errors = json.loads(_json)
-            if validate_signature:
-                for error in errors:
-                    identifiers = self._pop_validation_signature(error)
-                    self._validate_signature(identifiers, **parse_args)
-            return ErrorList(error_from_dict(x) for x in errors)
+            return error_from_dict(error, self._path_cache)
+        elif leading == '[':
+            errors = self._loads(_json)
         else:
             raise RuntimeError
 
+        if validate_signature:
+            for error in errors:
+                identifiers = self._pop_validation_signature(error)
+                self._validate_signature(identifiers, **parse_args)
+        return ErrorList(error_from_dict(x, self._path_cache) for x in errors)
+
+    def _errors_from_envelopes(self, envelopes, validate_signature, parse_args):
+        if isinstance(envelopes, dict):
+            envelopes = [envelopes]
+        for envelope in envelopes:
+            if validate_signature:
+                identifiers = self._pop_validation_signature(envelope['signature'])
+                self._validate_signature(identifiers, **parse_args)
+            for error in envelope['errors']:
+                yield error_from_dict(error, self._path_cache)
+
     def _pop_validation_signature(self, mapping):
         identifiers = {}
         identifiers['validator'] = mapping.pop('validator', None)
@@ -266,23 +850,18 @@ class JSONErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         _parse_args = self._parse_args.copy()
         _parse_args.update(parse_args)
 
-        if isinstance(buffer, IOBase):
+        if isinstance(buffer, IOBase) and self.compression is None:
             return self.parse(buffer.read(), **_parse_args)
+        elif isinstance(buffer, IOBase):
+            return self.parse(b''.join(self._iter_chunks(buffer.read)), **_parse_args)
         elif isinstance(buffer, socket):
-            rcvd_buffer = b''
-            while True:
-                chunk = buffer.recv(1024)
-                if not chunk:
-                    break
-                rcvd_buffer += chunk
-            return self.parse(rcvd_buffer.decode(self.encoding), **_parse_args)
+            return self.parse(self._receive(buffer), **_parse_args)
 
     def start(self, validator):
         if self._buffer_type is None:
             return
 
-        if self.used_emit_buffers[id(self._buffer)] == 0:
-            self._write_to_buffer('[')
-        self.used_emit_buffers[id(self.buffer)] += 1
+        EmissionSession.join(self, '' if self.format == 'jsonl' else '[')
         self._cached_validation_signature = self._validation_signature.copy()
-        self.__next_error_to_dump = ''
+        self.__emit_encoder = self._error_encoder(
+            None if self.envelope else self._cached_validation_signature)
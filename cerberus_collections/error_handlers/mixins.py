@@ -1,16 +1,133 @@
-from collections import defaultdict
+from functools import lru_cache
 from io import IOBase, BufferedIOBase, TextIOBase
+import pickle
 from socket import socket
+from threading import Lock, RLock, local
+from time import monotonic
 from warnings import warn
+from weakref import WeakKeyDictionary
 
-from cerberus import Validator
+from cerberus.errors import ErrorList
 
+from cerberus_collections.error_handlers.compression import StreamDecompressor, get_codec
 from cerberus_collections.error_handlers.exceptions import ValidationContextMismatch
+from cerberus_collections.error_handlers.index import ErrorIndex, IndexWriter
+from cerberus_collections.utils import batches, results_in_order
 from cerberus_collections.versions import CERBERUS_VERSION, __version__
 
 
+class EmissionSession:
+    """ Coordinates the error handlers that emit to the same buffer.
+
+        While at least one validation emits to a buffer, a session is
+        registered for it that all handlers with that buffer join. It
+        serializes their writes, makes the first participant open and the
+        last one close a container and holds the data that is coalesced for
+        the buffer. Once the last participant left, the session is discarded.
+        Buffers are referenced weakly, so the session of a validation that
+        was aborted before it left is discarded with its buffer and can't be
+        joined by handlers of another buffer.
+
+        If the first participant has a ``compression`` configured, all
+        data that is written in the session passes one streaming compressor
+        that is finished when the session ends.
+
+        Handlers can keep state that is bound to the written stream, like
+        tables of interned values, in :attr:`shared`.
+
+        If the first participant has an ``index`` configured, the session
+        tracks the offset in the buffer and adds an entry for every written
+        error to the index.
+
+        Handlers that are not emitting use a private, unregistered session.
+    """
+    _registry = WeakKeyDictionary()
+    _registry_lock = Lock()
+
+    def __init__(self):
+        self.lock = RLock()
+        self.participants = 0
+        self.records = 0
+        self.write_buffer = bytearray()
+        self.flushed = monotonic()
+        self.compressor = None
+        self.index = None
+        self.offset = 0
+        self.shared = {}
+
+    @classmethod
+    def join(cls, handler, opening=''):
+        """ Adds a handler to the session for its buffer and writes
+            ``opening`` if it's the first participant. ``opening`` can also be
+            a callable that returns it when the session starts.
+
+            :returns: The joined session.
+        """
+        buffer = handler.buffer
+        with cls._registry_lock:
+            session = cls._registry.get(buffer)
+            if session is None:
+                session = cls()
+                session.compressor = handler._make_compressor()
+                session.index = handler._make_index_writer()
+                if session.index is not None:
+                    session.offset = buffer.tell()
+                cls._registry[buffer] = session
+            with session.lock:
+                session.participants += 1
+                handler._session = session
+                if session.participants == 1 and callable(opening):
+                    opening = opening()
+                if session.participants == 1 and opening:
+                    handler._write_to_buffer(opening)
+        return session
+
+    def leave(self, handler, closing=''):
+        """ Removes a handler from the session, writes ``closing`` if it's the
+            last participant and flushes all coalesced data. ``closing`` can
+            also be a callable that returns it when the session ends. """
+        with self._registry_lock:
+            with self.lock:
+                self.participants -= 1
+                if not self.participants:
+                    if callable(closing):
+                        closing = closing()
+                    if closing:
+                        handler._write_to_buffer(closing)
+                    del self._registry[handler.buffer]
+                handler._flush_write_buffer()
+                if not self.participants and self.compressor is not None:
+                    handler._write_through(self.compressor.flush())
+                if not self.participants and self.index is not None:
+                    self.index.close()
+        handler._session = EmissionSession()
+
+    def write(self, handler, record, separator='', error=None):
+        """ Writes a record, preceded by ``separator`` if it's not the first
+            one in the session. ``record`` can also be a callable that writes
+            it. If an index is written, an entry that refers the record is
+            added for ``error``. """
+        with self.lock:
+            offset = self.offset
+            if self.records and separator:
+                record = separator + record
+                offset += len(separator)
+            if callable(record):
+                record()
+            else:
+                handler._write_to_buffer(record)
+            self.records += 1
+            if self.index is not None and error is not None:
+                self.index.add(handler.document_id, handler.schema_id, error.document_path,
+                               offset, self.offset - offset)
+
+
 class BufferAdapter:
-    used_emit_buffers = defaultdict(int)
+    write_buffer_size = 0
+    write_buffer_timeout = None
+    index = None
+    _compression = None
+    _codec = (None, None)
 
     @property
     def buffer(self):
@@ -21,33 +138,184 @@ class BufferAdapter:
         if isinstance(buffer, IOBase):
             self._buffer_type = IOBase
             if isinstance(buffer, BufferedIOBase):
-                self._write_to_buffer = self._write_to_binary_file
+                self._write_through = self._write_to_binary_file
             elif isinstance(buffer, TextIOBase):
-                self._write_to_buffer = self._write_to_text_file
+                self._write_through = self._write_to_text_file
             self._next_from_buffer = self._next_from_file
+            self._write_to_buffer = self._write_coalesced
 
         elif isinstance(buffer, socket):
             self._buffer_type = socket
             self._next_from_buffer = self._next_from_socket
-            self._write_to_buffer = self._write_to_socket
+            self._write_through = self._write_to_socket
+            self._write_to_buffer = self._write_coalesced
 
         else:
             self._buffer_type = None
             self._next_from_buffer = self.__nop
-            self._write_to_buffer = self.__nop
+            self._write_to_buffer = self._write_through = self.__nop
             if buffer is not None:
                 warn('Unknown buffer type, errors will not be emitted withot '
                      'notice and the error handler is not iterable.')
 
         self._buffer = buffer
+        self._session = EmissionSession()
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @compression.setter
+    def compression(self, compression):
+        self._codec = (None, None) if compression is None else get_codec(compression)
+        self._compression = compression
 
     def __nop(self, *args, **kwargs):
         pass
 
+    def _iter_chunks(self, read):
+        """ Yields the data that is read in chunks of :attr:`chunk_size`
+            until ``read`` returns nothing, decompressed if a
+            :attr:`compression` is set. """
+        decompressor = self._make_decompressor()
+        while True:
+            chunk = read(self.chunk_size)
+            if not chunk:
+                break
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            if chunk:
+                yield chunk
+
+    def _receive(self, sock):
+        """ Receives from a socket until the peer closes the connection. Data
+            is received in place into a preallocated buffer of
+            :attr:`chunk_size` and appended to a :class:`bytearray`, so no
+            intermediate objects are created per chunk. If a
+            :attr:`compression` is set, the received data is decompressed
+            at once.
+
+            :returns: The received data.
+            :rtype: :class:`bytearray` or :class:`bytes`
+        """
+        result = bytearray()
+        with memoryview(bytearray(self.chunk_size)) as receive_buffer:
+            while True:
+                received = sock.recv_into(receive_buffer)
+                if not received:
+                    break
+                result += receive_buffer[:received]
+
+        decompressor = self._make_decompressor()
+        if decompressor is not None:
+            return decompressor.decompress(result)
+        return result
+
+    def _make_compressor(self):
+        if self._codec[0] is None:
+            return None
+        if isinstance(self._buffer, TextIOBase):
+            raise TypeError('Compressed errors can only be written to binary buffers.')
+        return self._codec[0]()
+
+    def _make_index_writer(self):
+        if self.index is None:
+            return None
+        if self._codec[0] is not None:
+            raise ValueError("Compressed errors can't be indexed.")
+        if not isinstance(self._buffer, BufferedIOBase):
+            raise TypeError('Errors can only be indexed in binary files.')
+        return IndexWriter(self.index)
+
+    def _make_decompressor(self):
+        if self._codec[1] is None:
+            return None
+        return StreamDecompressor(self._codec[1])
+
+    def _flush_write_buffer(self):
+        """ Writes all coalesced data to the buffer. """
+        session = self._session
+        with session.lock:
+            if session.write_buffer:
+                self._write_compressed(session.write_buffer)
+                session.write_buffer = bytearray()
+            session.flushed = monotonic()
+
     def _next_from_file(self):
         raise NotImplementedError
     _next_from_socket = _next_from_file
 
+    def _parse_record(self, data):
+        raise NotImplementedError
+
+    def read_for(self, document_id=None, schema_id=None, document_path=None,
+                 buffer=None, index=None):
+        """ Reads the errors that match all given criteria from the
+            positions that an index refers. Only these records are read.
+
+            :param document_id: The ``document_id`` of the handler that
+                                emitted the errors.
+            :param schema_id: The ``schema_id`` of the handler that emitted
+                              the errors.
+            :param document_path: The errors' document paths must start with
+                                  this path.
+            :type document_path: tuple
+            :param buffer: The file to read from, :attr:`buffer` is used if
+                           :obj:`None` is provided.
+            :type buffer: :class:`io.BufferedIOBase`
+            :param index: The index, :attr:`index` is used if :obj:`None` is
+                          provided.
+            :type index: A path or a file opened in binary mode.
+            :returns: A list of :class:`~cerberus.errors.ValidationError`
+                      instances.
+        """
+        if buffer is None:
+            buffer = self._buffer
+        if index is None:
+            index = self.index
+
+        with ErrorIndex(index) as error_index:
+            spans = error_index.lookup(document_id, schema_id, document_path)
+
+        result = []
+        for offset, length in spans:
+            buffer.seek(offset)
+            error = self._parse_record(buffer.read(length))
+            if document_path is None or \
+                    tuple(error.document_path[:len(document_path)]) == tuple(document_path):
+                result.append(error)
+        return result
+
+    def _write_coalesced(self, data):
+        session = self._session
+        if session.index is not None:
+            if isinstance(data, str):
+                data = data.encode(self.encoding)
+            session.offset += len(data)
+        coalesce = self.write_buffer_size or self.write_buffer_timeout is not None
+        if not coalesce and not session.write_buffer:
+            self._write_compressed(data)
+            return
+
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        session.write_buffer += data
+
+        size, timeout = self.write_buffer_size, self.write_buffer_timeout
+        if not coalesce or (size and len(session.write_buffer) >= size) or \
+                (timeout is not None and monotonic() - session.flushed >= timeout):
+            self._flush_write_buffer()
+
+    def _write_compressed(self, data):
+        compressor = self._session.compressor
+        if compressor is not None:
+            if isinstance(data, str):
+                data = data.encode(self.encoding)
+            data = compressor.compress(bytes(data))
+            if not data:
+                return
+        self._write_through(data)
+
     def _write_to_binary_file(self, data):
         if isinstance(data, str):
             data = data.encode(self.encoding)
@@ -55,17 +323,76 @@ class BufferAdapter:
         self._buffer.flush()
 
     def _write_to_text_file(self, data):
-        if isinstance(data, bytes):
+        if not isinstance(data, str):
             data = data.decode(self.encoding)
         self._buffer.write(data)
         self._buffer.flush()
 
     def _write_to_socket(self, data):
-        if not isinstance(data, bytes):
+        if isinstance(data, str):
             data = data.encode(self.encoding)
         self._buffer.sendall(data)
 
 
+_worker_state = local()
+
+
+def _parse_chunk(arguments):
+    # the parser is created from the pickled configuration once per worker,
+    # as executors can't be initialized before Python 3.7
+    configuration, chunk, parse_args = arguments
+    if getattr(_worker_state, 'configuration', None) != configuration:
+        handler_class, handler_kwargs = pickle.loads(configuration)
+        _worker_state.parser = handler_class(**handler_kwargs)
+        _worker_state.configuration = configuration
+    return _worker_state.parser.parse(chunk, **parse_args)
+
+
+class ParallelParser:
+    """ Parses the records of large documents in chunks with a pool of
+        worker processes, each one with a handler that is configured like
+        the parsing one.
+
+        Handlers implement ``_parser_kwargs`` and ``_join_records``.
+    """
+    parallel_chunk_size = 512
+
+    def _parse_in_parallel(self, records, workers, parse_args):
+        """ Parses an iterable of encoded errors.
+
+            :returns: The errors in the order of the records.
+            :rtype: :class:`~cerberus.errors.ErrorList`
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        configuration = pickle.dumps((type(self), self._parser_kwargs))
+        chunks = ((configuration, self._join_records(x), parse_args)
+                  for x in batches(records, self.parallel_chunk_size))
+        result = ErrorList()
+        with ProcessPoolExecutor(workers) as pool:
+            for errors in results_in_order(pool, _parse_chunk, chunks, 2 * workers):
+                result.extend(errors)
+        return result
+
+
+@lru_cache(maxsize=256)
+def expected_signature(document_id, schema_id):
+    """ Returns the validation signature values that are expected for the
+        given identifiers. Results are cached as they are looked up for
+        every parsed error.
+
+        :returns: A mapping of signature fields to expected values.
+        :rtype: dict
+    """
+    result = {'validator': 'cerberus', 'version': CERBERUS_VERSION,
+              'handler_version': __version__}
+    if document_id is not None:
+        result['document_id'] = document_id
+    if schema_id is not None:
+        result['schema_id'] = schema_id
+    return result
+
+
 class ValidationContext:
     @property
     def _parse_args(self):
@@ -74,32 +401,28 @@ class ValidationContext:
                 'validate_signature': self.consider_context}
 
     def _validate_signature(self, error_identifiers, document_id=None, schema_id=None):
-        document_id = document_id or self.document_id
-        schema_id = schema_id or self.schema_id
-
-        schema = {'validator': {'allowed': ['cerberus']},
-                  'version': {'allowed': [CERBERUS_VERSION]},
-                  'handler_version': {'allowed': [__version__]}}
-        if document_id is not None:
-            schema.update({'document_id': {'allowed': [document_id]}})
-        if schema_id is not None:
-            schema.update({'schema_id': {'allowed': [schema_id]}})
-
-        validator = Validator(schema, allow_unknown=True, ignore_none_values=True)
-        validator(error_identifiers)
-
-        det = validator.document_error_tree
-        if det['validator'] or det['version']:
+        if document_id is None:
+            document_id = self.document_id
+        if schema_id is None:
+            schema_id = self.schema_id
+
+        expected = expected_signature(document_id, schema_id)
+        mismatches = {k for k, v in expected.items()
+                      if error_identifiers.get(k) not in (None, v)}
+        if not mismatches:
+            return
+
+        if 'validator' in mismatches or 'version' in mismatches:
             warn('The parsed error/s was/were generated with a different validator: {} {} != {} {}'
                  .format('cerberus', CERBERUS_VERSION,
-                         error_identifiers['validator'], error_identifiers['version']))
-        if det['handler_version']:
+                         error_identifiers.get('validator'), error_identifiers.get('version')))
+        if 'handler_version' in mismatches:
             warn('The error/s was/were serialized with a different handler version: {} != {}'
                  .format(__version__, error_identifiers['handler_version']))
-        if det['document_id']:
+        if 'document_id' in mismatches:
             raise ValidationContextMismatch("document_ids don't match: {} != {}"
                                             .format(document_id, error_identifiers['document_id']))
-        if det['schema_id']:
+        if 'schema_id' in mismatches:
             raise ValidationContextMismatch("schema_ids don't match: {} != {}"
                                             .format(schema_id, error_identifiers['schema_id']))
 
@@ -107,10 +430,4 @@ class ValidationContext:
     def _validation_signature(self):
         if not self.consider_context:
             return {}
-        result = {'validator': 'cerberus', 'version': CERBERUS_VERSION,
-                  'handler_version': __version__}
-        if self.document_id is not None:
-            result['document_id'] = self.document_id
-        if self.schema_id is not None:
-            result['schema_id'] = self.schema_id
-        return result
+        return expected_signature(self.document_id, self.schema_id).copy()
@@ -1,10 +1,14 @@
-from collections import Sequence
+from collections import Sequence, deque
+from contextlib import ExitStack
+from copy import deepcopy
 from datetime import datetime
 from io import IOBase
+from mmap import mmap
 from socket import socket
 from warnings import warn
 
-from lxml.etree import Element, ElementTree, _ElementTree, iterparse
+from lxml.etree import \
+    Element, ElementTree, XMLPullParser, _ElementTree, iterparse, xmlfile
 from lxml.etree import tostring as element_to_string
 from lxml.etree import fromstring as element_from_string
 
@@ -12,14 +16,34 @@ from cerberus import Validator
 from cerberus.errors import BaseErrorHandler, ValidationError
 
 from cerberus_collections.error_handlers.exceptions import DecodingError
-from cerberus_collections.error_handlers.mixins import BufferAdapter, ValidationContext
-from cerberus_collections.utils import binary_to_base64, base64_to_bytes
+from cerberus_collections.error_handlers.mixins import \
+    BufferAdapter, EmissionSession, ParallelParser, ValidationContext
+from cerberus_collections.utils import PathCache, binary_to_base64, base64_to_bytes
+
+
+def _registered(cls, key):
+    for klass in cls.__mro__:
+        if key in klass.__dict__.get('_registry', ()):
+            return klass._registry[key]
+
+
+def _register(cls, key, function):
+    if '_registry' not in cls.__dict__:
+        cls._registry = {}
+    cls._registry[key] = function
+
+    subclasses = [cls]
+    while subclasses:
+        klass = subclasses.pop()
+        klass.__dict__.get('_dispatch_table', {}).clear()
+        subclasses.extend(klass.__subclasses__())
 
 
 class Encoder:
     """ Encode Python objects to XML elements.
 
-        Supports almost all builtin types. If ``value`` has no complementing
+        Supports almost all builtin types. If ``value``'s type or one of its
+        base classes has neither a registered encoder nor a complementing
         method ``_encode_<type name>`` here, its string representation will be
         used.
 
@@ -36,8 +60,11 @@ class Encoder:
             :type value: any :class:`object`
             :rtype: :class:`lxml._Element`
         """
-        value_type = type(value).__name__
-        encoder = getattr(cls, '_encode_' + value_type, None)
+        try:
+            value_type, encoder = cls.__dict__['_dispatch_table'][type(value)]
+        except KeyError:
+            value_type, encoder = cls._lookup(type(value))
+
         element = Element(tag, type=value_type)
         if encoder is None:
             element.text = str(value)
@@ -51,6 +78,34 @@ class Encoder:
                 raise RuntimeError
         return element
 
+    @classmethod
+    def _lookup(cls, _type):
+        if '_dispatch_table' not in cls.__dict__:
+            cls._dispatch_table = {}
+
+        for base in _type.__mro__[:-1]:
+            encoder = _registered(cls, base) or getattr(cls, '_encode_' + base.__name__, None)
+            if encoder is not None:
+                result = (base.__name__, encoder)
+                break
+        else:
+            result = (_type.__name__, None)
+
+        cls._dispatch_table[_type] = result
+        return result
+
+    @classmethod
+    def register(cls, _type, encoder):
+        """ Registers an encoder for a type and its subclasses.
+
+            :param _type: The type to encode.
+            :type _type: :class:`type`
+            :param encoder: A callable that takes a value and returns either
+                            its text representation or a sequence of child
+                            elements.
+        """
+        _register(cls, _type, encoder)
+
     def __call__(self, *args, **kwargs):
         return self.encode(*args, **kwargs)
 
@@ -96,13 +151,18 @@ class Decoder:
             attribute to a Python object.
 
             :param element: The XML representation to decode, must have a
-                            ``type``-attribute that is used to lookup the
-                            decoding method ``_decode_<type name>``.
+                            ``type``-attribute that is used to lookup a
+                            registered decoder or the decoding method
+                            ``_decode_<type name>``.
             :type element: :class:`lxml._Element`
             :returns: The decoded object.
         """
         value_type = element.attrib['type']
-        decoder = getattr(cls, '_decode_' + value_type, None)
+        try:
+            decoder = cls.__dict__['_dispatch_table'][value_type]
+        except KeyError:
+            decoder = cls._lookup(value_type)
+
         if decoder is None:
             raise NotImplementedError('No decoder for {} found.'.format(value_type))
         else:
@@ -111,6 +171,29 @@ class Decoder:
             except (AssertionError, ValueError):
                 raise DecodingError(value_type, element.text)
 
+    @classmethod
+    def _lookup(cls, value_type):
+        if '_dispatch_table' not in cls.__dict__:
+            cls._dispatch_table = {}
+        decoder = _registered(cls, value_type) or getattr(cls, '_decode_' + value_type, None)
+        if decoder is not None:
+            cls._dispatch_table[value_type] = decoder
+        return decoder
+
+    @classmethod
+    def register(cls, _type, decoder):
+        """ Registers a decoder for a type.
+
+            :param _type: The type to decode or its name as used in the
+                          ``type``-attribute.
+            :type _type: :class:`type` or :class:`str`
+            :param decoder: A callable that takes an element and returns the
+                            decoded object.
+        """
+        if isinstance(_type, type):
+            _type = _type.__name__
+        _register(cls, _type, decoder)
+
     def __call__(self, *args, **kwargs):
         return self.decode(*args, **kwargs)
 
@@ -169,6 +252,10 @@ class Decoder:
     def _decode_list(cls, element):
         return [cls.decode(x) for x in element.iterfind('item')]
 
+    @staticmethod
+    def _decode_NoneType(element):
+        return None
+
     @classmethod
     def _decode_set(cls, element):
         return set(cls._decode_list(element))
@@ -185,13 +272,98 @@ class Decoder:
 default_encoder, default_decoder = Encoder(), Decoder()
 
 
-def element_from_error(error, encoder):
+class ElementCache:
+    """ Caches the elements of encoded constraints and paths, so that values
+        that recur with many errors, like the constraints of a schema's rules,
+        are only encoded once.
+
+        Constraints are cached by the errors' schema path and rule, paths by
+        themselves. A cached element is only used for the same value or an
+        equal one whose items are of the same types, too. Cached elements are
+        shared, they must be copied before they are inserted into a tree.
+
+        Once ``maxsize`` elements are cached, the cache is cleared.
+
+        :param maxsize: The maximum number of cached elements.
+        :type maxsize: int
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.elements = {}
+
+    def encode(self, encoder, error, attribute, value):
+        """ Returns the element that represents an error's attribute.
+
+            :param encoder: An encoder instance.
+            :type encoder: Something alike :class:`Encoder`.
+            :param error: The error the value belongs to.
+            :type error: :class:`~cerberus.errors.ValidationError`
+            :param attribute: ``constraint``, ``document_path`` or
+                              ``schema_path``.
+            :type attribute: str
+            :param value: The attribute's value.
+            :rtype: :class:`lxml._Element`
+        """
+        if attribute == 'constraint':
+            key = (attribute, error.schema_path, error.rule)
+        else:
+            key = (attribute, value)
+
+        cached = self.elements.get(key)
+        if cached is not None and cached[0] is value:
+            return cached[2]
+
+        # equal numbers of different types must not be confused, also not in
+        # containers
+        try:
+            typed = _typed(value)
+        except TypeError:  # unhashable items in sets or mappings
+            return encoder(attribute, value)
+        if cached is not None and cached[1] == typed:
+            return cached[2]
+
+        if len(self.elements) >= self.maxsize:
+            self.elements.clear()
+        element = encoder(attribute, value)
+        self.elements[key] = (value, typed, element)
+        return element
+
+
+def _typed(value):
+    # returns a representation of a value that includes the types of all items
+    value_type = type(value)
+    if value_type is tuple or value_type is list:
+        return value_type, tuple(_typed(x) for x in value)
+    elif value_type is set or value_type is frozenset:
+        return value_type, frozenset(_typed(x) for x in value)
+    elif value_type is dict:
+        return value_type, frozenset((_typed(k), _typed(v)) for k, v in value.items())
+    return value_type, value
+
+
+def _encode_error_values(error, encoder, cache):
+    # yields the elements of an error's paths, constraint and value and
+    # whether they are shared by the cache
+    for error_attribute in ('document_path', 'schema_path', 'constraint', 'value'):
+        value = getattr(error, error_attribute, None)
+        if value is None:
+            continue
+        if cache is None or error_attribute == 'value':
+            yield encoder(error_attribute, value), False
+        else:
+            yield cache.encode(encoder, error, error_attribute, value), True
+
+
+def element_from_error(error, encoder, cache=None):
     """ Makes an XML element representing a validation error.
 
         :param error: The error to encode.
         :type error: :class:`~cerberus.errors.ValidationError`
         :param encoder: An encoder instance.
         :type encoder: Something alike :class:`Encoder`.
+        :param cache: A cache that the elements of constraints and paths are
+                      taken from.
+        :type cache: :class:`ElementCache` or :obj:`None`
         :returns: An XML representation of the given error including childerrors.
         :rtype: :class:`lxml._Element`
     """
@@ -201,22 +373,20 @@ def element_from_error(error, encoder):
         'rule': error.rule or 'None'
     })
 
-    for error_attribute in ('document_path', 'schema_path', 'constraint', 'value'):
-        value = getattr(error, error_attribute, None)
-        if value is not None:
-            element.append(encoder(error_attribute, value))
+    element.extend(deepcopy(x) if shared else x
+                   for x, shared in _encode_error_values(error, encoder, cache))
 
     if error.is_logic_error:
         element.attrib['definitions'] = str(error.info[2])
         element.attrib['validated'] = str(error.info[1])
         for definition in error.definitions_errors:
             for child_error in error.definitions_errors[definition]:
-                child_element = element_from_error(child_error, encoder)
+                child_element = element_from_error(child_error, encoder, cache)
                 child_element.attrib['definition'] = str(definition)
                 element.append(child_element)
 
     elif error.is_group_error:
-        element.extend([element_from_error(x, encoder) for x in error.child_errors])
+        element.extend([element_from_error(x, encoder, cache) for x in error.child_errors])
 
     else:
         element.extend([encoder('info', x) for x in error.info])
@@ -224,13 +394,105 @@ def element_from_error(error, encoder):
     return element
 
 
-def error_from_element(element, decoder):
+def write_error(writer, error, encoder, attrib=None, cache=None):
+    """ Writes the XML representation of a validation error as
+        :func:`element_from_error` makes it to an incremental writer. Only
+        the elements of encoded values are built.
+
+        :param writer: The writer of an open :class:`lxml.etree.xmlfile`.
+        :param error: The error to encode.
+        :type error: :class:`~cerberus.errors.ValidationError`
+        :param encoder: An encoder instance.
+        :type encoder: Something alike :class:`Encoder`.
+        :param attrib: Additional attributes of the ``error``-element.
+        :type attrib: dict
+        :param cache: A cache that the elements of constraints and paths are
+                      taken from.
+        :type cache: :class:`ElementCache` or :obj:`None`
+    """
+    attributes = {'id': hex(hash(error))[3:], 'code': str(error.code),
+                  'rule': error.rule or 'None'}
+    if error.is_logic_error:
+        attributes['definitions'] = str(error.info[2])
+        attributes['validated'] = str(error.info[1])
+    if attrib:
+        attributes.update(attrib)
+
+    with writer.element('error', attributes):
+        for element, _ in _encode_error_values(error, encoder, cache):
+            writer.write(element)
+
+        if error.is_logic_error:
+            for definition in error.definitions_errors:
+                for child_error in error.definitions_errors[definition]:
+                    write_error(writer, child_error, encoder, {'definition': str(definition)},
+                                cache)
+
+        elif error.is_group_error:
+            for child_error in error.child_errors:
+                write_error(writer, child_error, encoder, cache=cache)
+
+        else:
+            for value in error.info:
+                writer.write(encoder('info', value))
+
+
+class IncrementalWriter:
+    """ Writes the ``errors``-element of an emission session and the errors
+        in it with lxml's incremental :class:`~lxml.etree.xmlfile` API. The
+        container is opened when the writer is created and closed with
+        :meth:`close`, the written data is passed to the buffer of the handler
+        that currently writes.
+
+        :param handler: The handler that opens the session.
+        :type handler: :class:`XMLErrorHandler`
+        :param attrib: The attributes of the ``errors``-element.
+        :type attrib: dict
+    """
+    def __init__(self, handler, attrib):
+        self.handler = handler
+        self._contexts = ExitStack()
+        self._writer = self._contexts.enter_context(xmlfile(self, encoding=handler.encoding))
+        self._contexts.enter_context(self._writer.element('errors', attrib))
+        self._writer.flush()
+
+    def write(self, data):
+        self.handler._write_to_buffer(data)
+
+    def write_error(self, handler, error, attrib):
+        """ Writes an error and passes it to the buffer. """
+        self.handler = handler
+        write_error(self._writer, error, handler.encoder, attrib, handler._element_cache)
+        self._writer.flush()
+
+    def close(self, handler):
+        """ Closes the ``errors``-element and passes the remaining data to
+            the buffer. """
+        self.handler = handler
+        self._contexts.close()
+
+
+def _decode_path(element, decoder, paths):
+    if paths is None:
+        return decoder(element)
+    # the serialization identifies the items and their types
+    key = element_to_string(element, with_tail=False)
+    result = paths.get(key)
+    if result is None:
+        result = paths.add(key, decoder(element))
+    return result
+
+
+def error_from_element(element, decoder, paths=None):
     """ Transforms an XML error representation to a validation error object.
 
         :param error: The XML element to transform.
         :type error: :class:`lxml._Element`
         :param decoder: An decoder instance.
         :type decoder: Something alike :class:`Decoder`.
+        :param paths: A cache that decoded paths are looked up in and added
+                      to.
+        :type paths: :class:`~cerberus_collections.utils.PathCache`
         :returns: A validation error object.
         :rtype: :class:`~cerberus.errors.ValidationError`
     """
@@ -239,14 +501,15 @@ def error_from_element(element, decoder):
     if constraint is not None:
         constraint = decoder(constraint)
 
-    error = ValidationError(decoder(element.find('document_path')),
-                            decoder(element.find('schema_path')),
+    error = ValidationError(_decode_path(element.find('document_path'), decoder, paths),
+                            _decode_path(element.find('schema_path'), decoder, paths),
                             int(element.attrib['code']), rule, constraint,
                             decoder(element.find('value')),
                             info=())
 
     if error.is_group_error:
-        error.info = ([error_from_element(x, decoder) for x in element.iterfind('error')],)
+        error.info = ([error_from_element(x, decoder, paths)
+                       for x in element.iterfind('error')],)
         if error.is_logic_error:
             error.info += (int(element.attrib['validated']), int(element.attrib['definitions']))
     else:
@@ -255,7 +518,98 @@ def error_from_element(element, decoder):
     return error
 
 
-class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
+def _release(element):
+    # frees a processed top-level element and its preceding siblings
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+        parent.remove(element)
+
+
+def iter_error_elements(source):
+    """ Incrementally parses an XML file of errors.
+
+        Yields the ``errors`` container element as soon as its start tag was
+        parsed and top-level ``error`` elements once they are complete. A
+        yielded error element and its preceding siblings are released when
+        the next element is requested, so the consumed memory doesn't grow
+        with the file's size.
+
+        :param source: The file to parse. A path is read by libxml2 directly,
+                       without copying the data through Python objects.
+        :type source: :class:`io.IOBase`, :class:`mmap.mmap` or :class:`str`
+    """
+    depth = 0
+    for event, element in iterparse(source, events=('start', 'end'), tag=('errors', 'error')):
+        if element.tag == 'errors':
+            if event == 'start':
+                yield element
+            continue
+        depth += 1 if event == 'start' else -1
+        if event == 'end' and not depth:
+            yield element
+            _release(element)
+
+
+class ErrorStreamParser:
+    """ Incrementally parses an XML stream of errors.
+
+        :meth:`feed` returns the ``errors`` container element as soon as its
+        start tag was parsed and top-level ``error`` elements once they are
+        complete. Returned error elements are supposed to be processed before
+        the next call as the memory they and their preceding siblings occupy
+        is released then.
+    """
+    def __init__(self):
+        self.parser = XMLPullParser(events=('start', 'end'))
+        self.depth = 0
+        self._head = b''
+        self._processed = None
+
+    def feed(self, data):
+        """ Consumes a chunk of the stream.
+
+            :param data: The next part of the stream.
+            :type data: :class:`bytes`
+            :returns: A list of ``errors`` and ``error`` elements.
+        """
+        self._release_processed()
+        if self._head is not None:
+            data = self._check_container(data)
+        self.parser.feed(data)
+        result = []
+        for event, element in self.parser.read_events():
+            if element.tag == 'errors':
+                if event == 'start':
+                    result.append(element)
+            elif element.tag == 'error':
+                self.depth += 1 if event == 'start' else -1
+                if event == 'end' and not self.depth:
+                    result.append(element)
+                    self._processed = element
+        return result
+
+    def _check_container(self, data):
+        # a stream of error elements without container has no single root
+        head = self._head + data
+        if len(head.lstrip()) < len(b'<errors'):
+            self._head = head
+            return b''
+        self._head = None
+        if head.lstrip().startswith(b'<error') and not head.lstrip().startswith(b'<errors'):
+            warn('Opening <errors> element is missing.')
+            head = b'<errors>' + head
+        return head
+
+    def _release_processed(self):
+        element, self._processed = self._processed, None
+        if element is not None:
+            _release(element)
+
+
+class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext, ParallelParser):
     """ An error handler that (de-)serializes cerberus validation errors to and
         from XML.
 
@@ -296,14 +650,57 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
                         :class:`~cerberus_collections.error_handlers.xml.Encoder`.
         :param decoder: An instance of something alike
                         :class:`~cerberus_collections.error_handlers.xml.Decoder`.
+        :param write_buffer_size: Coalesce emitted data and write it to the
+                                  ``buffer`` once this many bytes are
+                                  collected or the validation ends.
+                                  ``0`` writes every fragment immediately.
+        :type write_buffer_size: int
+        :param write_buffer_timeout: Also write coalesced data when this many
+                                     seconds have passed since the last write.
+        :type write_buffer_timeout: float or :obj:`None`
+        :param chunk_size: The amount of data that is read at once from a
+                           ``buffer`` while iterating.
+        :type chunk_size: int
+        :param compression: Compress emitted data and decompress data that is
+                            read from a ``buffer`` with ``gzip``, ``lzma``,
+                            ``zstd`` (requires ``zstandard``) or ``lz4``.
+                            Files must be opened in binary mode.
+        :type compression: str or :obj:`None`
+        :param index: Write a sidecar index that refers the emitted errors by
+                      the handler's ``document_id`` and ``schema_id`` and
+                      their document paths' first item to this path or file.
+                      It's appended to and used by :meth:`read_for`. The
+                      ``buffer`` must be a file that is opened in binary mode.
+        :type index: str or :class:`io.BufferedIOBase`
+        :param incremental: Write emitted errors with an
+                            :class:`IncrementalWriter` that streams the
+                            elements to the ``buffer`` as they are generated
+                            instead of building and serializing a tree for
+                            each error. ``prettify`` doesn't apply to
+                            emitted errors then.
+        :type incremental: bool
+        :param encoding_cache_size: Encode the constraints and paths of errors
+                                    with an :class:`ElementCache` of this
+                                    size. ``0`` disables the cache. It should
+                                    only be used with encoders that return
+                                    the same representation for equal values.
+        :type encoding_cache_size: int
     """
     encoder = default_encoder
     decoder = default_decoder
 
-    # TODO add compress option
     def __init__(self, buffer=None, prettify=False, encoding='utf-8',
                  consider_context=False, document_id=None, schema_id=None,
-                 encoder=None, decoder=None):
+                 encoder=None, decoder=None, write_buffer_size=0, write_buffer_timeout=None,
+                 chunk_size=65536, compression=None, index=None, incremental=False,
+                 encoding_cache_size=0):
+        self.incremental = incremental
+        self.encoding_cache_size = encoding_cache_size
+        self.compression = compression
+        self.index = index
+        self.chunk_size = chunk_size
+        self.write_buffer_size = write_buffer_size
+        self.write_buffer_timeout = write_buffer_timeout
         self.buffer = buffer
         self.prettify = prettify
         self.encoding = encoding
@@ -311,6 +708,7 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         self.document_id = document_id
         self.schema_id = schema_id
         self._cached_validation_signature = None
+        self._path_cache = PathCache()
         if encoder:
             self.encoder = encoder
         if decoder:
@@ -323,7 +721,8 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
             errors = errors._errors
         if errors is not None:
             self.clear()
-            self.root.extend([element_from_error(x, self.encoder) for x in errors])
+            self.root.extend([element_from_error(x, self.encoder, self._element_cache)
+                              for x in errors])
         return self.tree
 
     def __iter__(self):
@@ -331,22 +730,12 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
             raise RuntimeError("{} must have a 'buffer'-property set.".format(repr(self)))
 
         elif self._buffer_type is IOBase:
-            self.__iterparser = iterparse(self._buffer, events=('start', 'end'))
+            self.__errors = self.iterread(self._buffer)
 
         elif self._buffer_type is socket:
-            buffer = b''
-            while b'>' not in buffer:
-                buffer += self._buffer.recv(1024)
-
-            if buffer.startswith(b'<errors'):
-                container_element, self.__socketbuffer = buffer.split(b'>', 1)
-                container_element += b'></errors>'
-                container_element = element_from_string(container_element)
-                self._validate_signature(container_element)
-            else:
-                warn('Opening <errors> element is missing.')
-                if not buffer.startswith(b'<error'):
-                    raise StopIteration
+            self.__chunks = self._iter_chunks(self._buffer.recv)
+            self.__stream_parser = ErrorStreamParser()
+            self.__parsed_errors = deque()
 
         return self
 
@@ -357,7 +746,16 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         return self._as_string(self.root).decode(self.encoding)
 
     def add(self, error):
-        self.root.append(element_from_error(error, self.encoder))
+        self.root.append(element_from_error(error, self.encoder, self._element_cache))
+
+    @property
+    def encoding_cache_size(self):
+        return self._encoding_cache_size
+
+    @encoding_cache_size.setter
+    def encoding_cache_size(self, size):
+        self._element_cache = ElementCache(size) if size else None
+        self._encoding_cache_size = size
 
     def _as_string(self, element):
         return element_to_string(element, encoding=self.encoding,
@@ -365,65 +763,61 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
 
     def clear(self):
         """ Clears collected errors. """
-        self.root = Element('errors', attrib=self._validation_signature)
+        self.root = Element('errors', attrib=self._validation_attributes)
         self.tree = ElementTree(self.root)
 
     def end(self, validator):
         if self._buffer_type is None:
             return
 
-        self.used_emit_buffers[id(self._buffer)] -= 1
-        if not self.used_emit_buffers[id(self._buffer)]:
-            self._write_to_buffer('</errors>')
+        if self.incremental:
+            self._session.leave(self, self._close_incremental_writer)
+        else:
+            self._session.leave(self, '</errors>')
         self._cached_validation_signature = None
 
     def emit(self, error):
         if self._buffer_type is None:
             return
-        result = element_from_error(error, self.encoder)
+        if self.incremental:
+            writer = self._session.shared['writer']
+            self._session.write(
+                self, lambda: writer.write_error(self, error, self._cached_validation_signature),
+                error=error)
+            return
+
+        result = element_from_error(error, self.encoder, self._element_cache)
         result.attrib.update(self._cached_validation_signature)
         result = self._as_string(result)
 
-        self._write_to_buffer(result.strip())
+        self._session.write(self, result.strip(), error=error)
 
     def _next_from_file(self):
-        depth = 0
-        while True:
-            event, element = next(self.__iterparser)
-            if element.tag != 'error':
-                continue
-            if event == 'start':
-                depth += 1
-            elif event == 'end':
-                depth -= 1
-                if depth == 0:
-                    return self.parse(element, **self._parse_args)
+        return next(self.__errors)
 
     def _next_from_socket(self):
-        element_string = b''
-        buffer = self.__socketbuffer
-
-        if buffer == b'</errors>':
-            raise StopIteration
-
-        while True:
-            if b'</error>' not in buffer:
-                buffer += self._buffer.recv(1024)
-                continue
-
-            element_part, buffer = buffer.split(b'</error>', 1)
-            element_string += (element_part + b'</error>')
-            while buffer.startswith(b'</error>'):
-                element_string += b'</error>'
-                buffer = buffer[len(b'</error>'):]
-
-            if element_string.count(b'<error') > element_string.count(b'</error>'):
-                continue
-
-            self.__socketbuffer = buffer
-            return self.parse(element_string, **self._parse_args)
+        while not self.__parsed_errors:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                raise StopIteration
+            self.__parsed_errors.extend(
+                self._parse_stream_elements(self.__stream_parser.feed(chunk)))
+        return self.__parsed_errors.popleft()
+
+    def _parse_record(self, data):
+        return self.parse(data, **self._parse_args)
+
+    def _parse_stream_elements(self, elements):
+        result = []
+        for element in elements:
+            if element.tag == 'errors':
+                self._validate_signature(element)
+            else:
+                result.append(self.parse(element, **self._parse_args))
+        return result
 
-    def parse(self, _input, document_id=None, schema_id=None, validate_signature=True):
+    def parse(self, _input, document_id=None, schema_id=None, validate_signature=True,
+              workers=None):
         """ Parses XML, represented in different forms, to cerberus error
             representations.
 
@@ -439,6 +833,9 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
             :param validate_signature: Controls whether to check validation
                    signature.
             :type validate_signature: bool
+            :param workers: Parse the errors of an ``errors``-element in
+                            chunks with this many worker processes.
+            :type workers: int
             :returns: The parsed error or errors.
             :rtype: A :class:`~cerberus.errors.ValidationError` instance if an
                     ``error``-element was provided, or a list of these in case
@@ -454,51 +851,139 @@ class XMLErrorHandler(BaseErrorHandler, BufferAdapter, ValidationContext):
         if validate_signature:
             self._validate_signature(_input, document_id, schema_id)
 
-        if _input.tag == 'errors':
+        if _input.tag == 'errors' and workers:
+            return self._parse_in_parallel(
+                (element_to_string(x, with_tail=False) for x in _input.iterfind('error')),
+                workers, {'validate_signature': False})
+        elif _input.tag == 'errors':
             return [self.parse(x, validate_signature=False) for x in _input.iterfind('error')]
         elif _input.tag == 'error':
-            return error_from_element(_input, self.decoder)
+            return error_from_element(_input, self.decoder, self._path_cache)
 
     def read(self, buffer=None, **parse_args):
         """ Reads from a buffer and returns the parsed cerberus error
             representations.
 
             :param buffer: The buffer to read from, :attr:`buffer` is used if
-                           :obj:`None` is provided.
-            :type buffer: :class:`io.IOBase` (like file objects) or
+                           :obj:`None` is provided. Files are parsed
+                           incrementally, see :meth:`iterread`, and with
+                           ``workers`` the parsed chunks are decoded while the
+                           file is read.
+            :type buffer: :class:`io.IOBase` (like file objects),
+                          :class:`mmap.mmap`, a path as :class:`str` or
                           :class:`socket.socket`
             :param parse_args: See :meth:`~cerberus_collections.XMLErrorHandler.parse`'s
                                     keyword arguments.
             :returns: A list of :class:`~cerberus.errors.ValidationError`
                       instances.
         """
-        buffer = buffer or self._buffer
+        if buffer is None:
+            buffer = self._buffer
         _parse_args = self._parse_args.copy()
         _parse_args.update(parse_args)
 
-        if isinstance(buffer, IOBase):
-            return self.parse(ElementTree().parse(buffer), **_parse_args)
+        if isinstance(buffer, (IOBase, mmap, str)) and _parse_args.get('workers'):
+            workers = _parse_args.pop('workers')
+            return self._parse_in_parallel(self._iter_error_records(buffer, **_parse_args),
+                                           workers, {'validate_signature': False})
+        elif isinstance(buffer, (IOBase, mmap, str)):
+            return list(self.iterread(buffer, **_parse_args))
         elif isinstance(buffer, socket):
-            recv_buffer = b''
-            while True:
-                chunk = buffer.recv(4096)
-                if not chunk:
-                    break
-                recv_buffer += chunk
-            return self.parse(element_from_string(recv_buffer), **_parse_args)
+            return self.parse(element_from_string(self._receive(buffer)), **_parse_args)
         else:
             raise RuntimeError("Can't read from object %s" % repr(buffer))
 
+    def iterread(self, source=None, **parse_args):
+        """ Iterates over the errors in a file. Only the error that is
+            currently parsed is kept in memory, so this is suited for files
+            of any size.
+
+            :param source: The file to read from, :attr:`buffer` is used if
+                           :obj:`None` is provided. A path is read by libxml2
+                           directly.
+            :type source: :class:`io.IOBase` (like file objects),
+                          :class:`mmap.mmap` or a path as :class:`str`
+            :param parse_args: See :meth:`~cerberus_collections.XMLErrorHandler.parse`'s
+                                    keyword arguments.
+            :returns: A generator of :class:`~cerberus.errors.ValidationError`
+                      instances.
+        """
+        if source is None:
+            source = self._buffer
+        _parse_args = self._parse_args.copy()
+        _parse_args.update(parse_args)
+
+        for element in self._iter_elements(source):
+            if element.tag == 'error':
+                yield self.parse(element, **_parse_args)
+            elif _parse_args['validate_signature']:
+                self._validate_signature(element, _parse_args['document_id'],
+                                         _parse_args['schema_id'])
+
+    def _iter_elements(self, source):
+        if self.compression is None:
+            return iter_error_elements(source)
+        else:
+            return self._iter_decompressed_elements(source)
+
+    def _iter_error_records(self, source, document_id=None, schema_id=None,
+                            validate_signature=True):
+        for element in self._iter_elements(source):
+            if element.tag == 'error':
+                yield element_to_string(element, with_tail=False)
+            elif validate_signature:
+                self._validate_signature(element, document_id, schema_id)
+
+    def _iter_decompressed_elements(self, source):
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                yield from self._iter_decompressed_elements(f)
+            return
+
+        stream_parser = ErrorStreamParser()
+        for chunk in self._iter_chunks(source.read):
+            yield from stream_parser.feed(chunk)
+
     def start(self, validator):
         if self._buffer_type is None:
             return
 
-        self._cached_validation_signature = self._validation_signature
-        if id(self._buffer) not in self.used_emit_buffers:
-            container_element = Element('errors', self._validation_signature)
-            container_element = element_to_string(container_element, method='html')
-            self._write_to_buffer(container_element[:-len('</errors>')])
-        self.used_emit_buffers[id(self._buffer)] += 1
+        self._cached_validation_signature = self._validation_attributes
+        if self.incremental:
+            EmissionSession.join(self, self._open_incremental_writer)
+            return
+
+        container_element = Element('errors', self._cached_validation_signature)
+        container_element = element_to_string(container_element, method='html')
+        EmissionSession.join(self, container_element[:-len('</errors>')])
 
-    def _validate_signature(self, element, *args, **kwargs):
-        super()._validate_signature(dict(element.attrib), *args, **kwargs)
+    def _open_incremental_writer(self):
+        self._session.shared['writer'] = \
+            IncrementalWriter(self, self._cached_validation_signature)
+
+    def _close_incremental_writer(self):
+        self._session.shared.pop('writer').close(self)
+
+    @staticmethod
+    def _join_records(records):
+        return b'<errors>' + b''.join(records) + b'</errors>'
+
+    @property
+    def _parser_kwargs(self):
+        return {'encoding': self.encoding, 'consider_context': self.consider_context,
+                'document_id': self.document_id, 'schema_id': self.schema_id,
+                'encoder': self.encoder, 'decoder': self.decoder}
+
+    @property
+    def _validation_attributes(self):
+        return {k: str(v) for k, v in self._validation_signature.items()}
+
+    def _validate_signature(self, element, document_id=None, schema_id=None):
+        if document_id is None:
+            document_id = self.document_id
+        if schema_id is None:
+            schema_id = self.schema_id
+        super()._validate_signature(
+            dict(element.attrib),
+            None if document_id is None else str(document_id),
+            None if schema_id is None else str(schema_id))
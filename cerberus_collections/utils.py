@@ -1,8 +1,95 @@
 from base64 import b64encode, b64decode
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+import re
 
 from cerberus.errors import ErrorList, ValidationError
 
 
+class PathCache:
+    """ Interns decoded paths, so that equal paths of decoded errors are
+        the same :class:`tuple` and equal strings in different paths the same
+        :class:`str`.
+
+        Once ``maxsize`` paths are cached, the cache is cleared, so that
+        streams with many distinct document paths don't grow it indefinitely.
+
+        :param maxsize: The maximum number of cached paths.
+        :type maxsize: int
+    """
+    def __init__(self, maxsize=65536):
+        self.maxsize = maxsize
+        self.paths = {}
+        self.items = {}
+
+    def __call__(self, path):
+        """ Returns the interned equivalent of a decoded path.
+
+            :param path: The path's items.
+            :type path: A sequence.
+            :rtype: tuple
+        """
+        path = tuple(path)
+        cached = self.paths.get(path)
+        if cached is None:
+            return self.add(path, path)
+
+        # equal numbers of different types must not be confused, paths that
+        # consist of strings can only be equal to such
+        result, types = cached
+        if types is None or types == tuple(map(type, path)):
+            return result
+        return path
+
+    def add(self, key, path):
+        """ Caches a path under a key that identifies its encoded
+            representation.
+
+            :returns: The interned path.
+            :rtype: tuple
+        """
+        if len(self.paths) >= self.maxsize:
+            self.paths.clear()
+            self.items.clear()
+        items = self.items
+        result = tuple(items.setdefault(x, x) if type(x) is str else x for x in path)
+        if all(type(x) is str for x in path):
+            self.paths[key] = (result, None)
+        else:
+            self.paths[key] = (result, tuple(map(type, path)))
+        return result
+
+    def get(self, key):
+        """ Returns the path that was cached under ``key`` or :obj:`None`. """
+        cached = self.paths.get(key)
+        return None if cached is None else cached[0]
+
+
+def batches(iterable, size):
+    """ Yields lists of ``size`` consecutive items, the last one may be
+        shorter. """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            break
+        yield batch
+
+
+def results_in_order(executor, function, arguments, window):
+    """ Submits ``function`` for each argument to an executor and yields the
+        results in the order of submission while at most ``window`` calls
+        are pending. """
+    pending = deque()
+    for argument in arguments:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, argument))
+    while pending:
+        yield pending.popleft().result()
+
+
 def binary_to_base64(value):
     if not isinstance(value, bytes):
         value = bytes(value)
@@ -13,6 +100,45 @@ def base64_to_bytes(value):
     return b64decode(value)
 
 
+# the forms that date.isoformat and datetime.isoformat produce, the latter
+# with optional microseconds and an optional UTC offset
+isoformat_pattern = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{6}))?'
+    r'(?:([+-])(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{6}))?)?)?)?$')
+
+
+def date_from_isoformat(value):
+    """ Parses the result of :meth:`datetime.date.isoformat`. Unlike
+        :meth:`datetime.date.fromisoformat`, this is available before Python
+        3.7. """
+    match = isoformat_pattern.match(value)
+    if match is None or match.group(4) is not None:
+        raise ValueError('Invalid isoformat string: {!r}'.format(value))
+    return date(*map(int, match.group(1, 2, 3)))
+
+
+def datetime_from_isoformat(value):
+    """ Parses the result of :meth:`datetime.datetime.isoformat`. Unlike
+        :meth:`datetime.datetime.fromisoformat`, this is available before
+        Python 3.7. """
+    match = isoformat_pattern.match(value)
+    if match is None or match.group(4) is None:
+        raise ValueError('Invalid isoformat string: {!r}'.format(value))
+    (year, month, day, hour, minute, second, microsecond,
+     sign, offset_hours, offset_minutes, offset_seconds, offset_microseconds) = match.groups()
+
+    tzinfo = None
+    if sign is not None:
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes),
+                           seconds=int(offset_seconds or 0),
+                           microseconds=int(offset_microseconds or 0))
+        tzinfo = timezone(-offset if sign == '-' else offset)
+
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                    int(microsecond or 0), tzinfo)
+
+
 def error_as_dict(error):
     mapping = {x: getattr(error, x) for x in ('code', 'constraint',
                                               'document_path', 'field', 'rule',
@@ -27,15 +153,20 @@ def error_as_dict(error):
     return mapping
 
 
-def error_from_dict(mapping):
-    error = ValidationError(document_path=tuple(mapping['document_path']),
-                            schema_path=tuple(mapping['schema_path']),
+def error_from_dict(mapping, paths=None):
+    if paths is None:
+        document_path, schema_path = \
+            tuple(mapping['document_path']), tuple(mapping['schema_path'])
+    else:
+        document_path, schema_path = paths(mapping['document_path']), paths(mapping['schema_path'])
+
+    error = ValidationError(document_path=document_path, schema_path=schema_path,
                             code=mapping['code'], rule=mapping['rule'],
                             constraint=mapping['constraint'], value=mapping['value'],
                             info=())
 
     if error.is_group_error:
-        child_errors = ErrorList(error_from_dict(x) for x in mapping['info'][0])
+        child_errors = ErrorList(error_from_dict(x, paths) for x in mapping['info'][0])
         error.info = (child_errors,) + tuple(mapping['info'][1:])
     else:
         error.info = tuple(mapping['info'])
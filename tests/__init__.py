@@ -35,3 +35,14 @@ def assert_equal_errors(e1, e2):
         assert e1.info == e2.info
         if e1.is_group_error:
             assert_equal_errors(e1.child_errors, e2.child_errors)
+
+
+def run_coroutine(coroutine):
+    """ Runs a coroutine in a new event loop, like asyncio.run does since
+        Python 3.7. """
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
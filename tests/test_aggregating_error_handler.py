@@ -0,0 +1,119 @@
+from io import BytesIO
+import pickle
+import sys
+
+from pytest import raises
+
+from cerberus_collections import \
+    AggregatingErrorHandler, JSONErrorHandler, Validator, XMLErrorHandler, validate_many
+from cerberus_collections.error_handlers.aggregating import ErrorSummary
+from cerberus_collections.error_handlers.exceptions import ValidationContextMismatch
+
+from . import sample_document, sample_schema
+
+schema = {'name': {'type': 'string', 'maxlength': 8}, 'age': {'type': 'integer', 'min': 0}}
+documents = [{'name': 'x' * (i % 12), 'age': i % 7 - 3} for i in range(50)]
+
+
+def count_errors(errors):
+    return sum(1 + count_errors(x.child_errors) if x.is_group_error else 1 for x in errors)
+
+
+def test_simple():
+    validator = Validator(sample_schema, error_handler=AggregatingErrorHandler)
+    validator(sample_document)
+    summary = validator.errors
+    assert sum(x['count'] for x in summary) == count_errors(validator._errors)
+    assert {(tuple(x['schema_path']), x['rule']) for x in summary} >= \
+        {(x.schema_path, x.rule) for x in validator._errors}
+
+    validator(sample_document)
+    assert sum(x['count'] for x in validator.error_handler()) == \
+        2 * count_errors(validator._errors)
+    assert list(validator.error_handler) == validator.error_handler()
+    validator.error_handler.clear()
+    assert validator.error_handler() == []
+
+
+def test_samples_and_merge():
+    summaries = [ErrorSummary(sample_size=3, seed=i) for i in range(2)]
+    validator = Validator(schema)
+    for document_id, document in enumerate(documents):
+        validator(document)
+        for error in validator._errors:
+            summaries[document_id % 2].add(error, document_id)
+
+    summary = pickle.loads(pickle.dumps(summaries[0]))
+    summary.merge(summaries[1])
+    expected = AggregatingErrorHandler(sample_size=50)
+    for document in documents:
+        validator(document)
+        expected.extend(validator._errors)
+    assert [(x['rule'], x['count']) for x in summary.as_list()] == \
+        [(x['rule'], x['count']) for x in expected()]
+
+    for entry in summary.as_list():
+        assert len(entry['samples']) == min(3, entry['count'])
+        for sample in entry['samples']:
+            document = documents[sample['document_id']]
+            assert document[sample['document_path'][0]] == sample['value']
+
+
+def test_merge_while_counting():
+    from threading import Thread
+
+    validator = Validator(schema)
+    validator({'name': 'x' * 12, 'age': -1})
+    errors = validator._errors
+    source = ErrorSummary()
+
+    def count():
+        for i in range(2000):
+            for error in errors:
+                source.add(error, i)
+            # new keys make the dictionary grow while it's merged
+            source.add(type(error)(('n', i), ('n', i), 0x41, 'type', None, None, ()))
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        thread = Thread(target=count)
+        thread.start()
+        while thread.is_alive():
+            ErrorSummary().merge(source)
+        thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    target = ErrorSummary()
+    target.merge(source)
+    assert sum(x['count'] for x in target.as_list()) == 2000 * (len(errors) + 1)
+
+
+def test_validate_many():
+    summary = ErrorSummary()
+    invalid_documents = validate_many(documents, schema, workers=3, chunk_size=4,
+                                      error_handler=(AggregatingErrorHandler,
+                                                     {'summary': summary}))
+    assert sum(x['count'] for x in summary.as_list()) >= len(invalid_documents)
+    sampled = {x['document_id'] for entry in summary.as_list() for x in entry['samples']}
+    assert sampled <= set(invalid_documents)
+
+
+def test_render_and_load():
+    validator = Validator(sample_schema, error_handler=AggregatingErrorHandler)
+    validator(sample_document)
+    summary = validator.error_handler.summary
+
+    for handler in (JSONErrorHandler(typed_values=True, consider_context=True, document_id='foo'),
+                    XMLErrorHandler(consider_context=True, document_id='foo')):
+        rendered = summary.render(handler)
+        assert ErrorSummary.load(rendered, handler).as_list() == summary.as_list()
+        handler.document_id = 'bar'
+        with raises(ValidationContextMismatch):
+            ErrorSummary.load(rendered, handler)
+
+    with raises(TypeError):
+        summary.render(AggregatingErrorHandler())
+    buffer = BytesIO(XMLErrorHandler()._as_string(summary.render(XMLErrorHandler())))
+    assert ErrorSummary.load(buffer.getvalue(), XMLErrorHandler()).as_list() == summary.as_list()
@@ -0,0 +1,110 @@
+from datetime import date, datetime, timedelta, timezone
+from io import BytesIO, StringIO
+from socket import socketpair
+
+from pytest import raises
+
+from cerberus_collections import BinaryErrorHandler, Validator, validate_many
+from cerberus_collections.error_handlers.binary import \
+    PATH, RecordScanner, decode_value, encode_value
+from cerberus_collections.error_handlers.exceptions import \
+    DecodingError, ValidationContextMismatch
+
+from . import assert_equal_errors, sample_document, sample_schema
+
+
+def test_values():
+    values = [None, True, False, 0, -1, 2 ** 70, -2 ** 70, 1.5, 1 + 2j, '', 'äöü',
+              b'\x00\xff', bytearray(b'x'), date(2016, 9, 1), datetime(2016, 9, 1, 12, 0, 1),
+              datetime(2016, 9, 1, 12, 0, 1, 500, tzinfo=timezone(timedelta(hours=2))),
+              [1, [2]], (1, ('a',)), {1, 2}, frozenset('ab'), {1: {(2, 3): None}}]
+    out = bytearray()
+    for value in values:
+        encode_value(out, value)
+    data, position = bytes(out), 0
+    for value in values:
+        decoded, position = decode_value(data, position)
+        assert decoded == value
+        assert type(decoded) is type(value)
+    assert position == len(data)
+
+    with raises(TypeError):
+        encode_value(bytearray(), object())
+    with raises(DecodingError):
+        decode_value(b'?')
+
+
+def test_simple():
+    validator = Validator(error_handler=BinaryErrorHandler)
+    validator(sample_document, sample_schema)
+    assert isinstance(validator.errors, bytes)
+    parsed_errors = validator.error_handler.parse(validator.errors)
+    assert_equal_errors(validator._errors, parsed_errors)
+
+
+def test_paths_are_interned():
+    validator = Validator({'a_list': {'type': 'list', 'schema': {'type': 'integer'}}},
+                          error_handler=BinaryErrorHandler)
+    validator({'a_list': ['x'] * 100})
+    dump = validator.errors
+    scanner = RecordScanner()
+    records = [x for i in range(0, len(dump), 7) for x in scanner.feed(dump[i:i + 7])]
+    # the group error's paths and one child's schema path, each child's document path
+    assert len([x for x in records if x[0] == PATH]) == 3 + 100
+
+
+def test_emit_and_iter_through_file():
+    buffer = BytesIO()
+    validator = Validator(sample_schema, error_handler=(BinaryErrorHandler,
+                                                        {'buffer': buffer,
+                                                         'consider_context': True,
+                                                         'document_id': 'foo'}))
+    validator(sample_document)
+    expected = validator._errors
+    validator(sample_document)
+    expected += validator._errors
+
+    buffer.seek(0)
+    parsed_errors = list(BinaryErrorHandler(buffer=buffer, consider_context=True,
+                                            document_id='foo', chunk_size=5))
+    assert_equal_errors(expected, parsed_errors)
+
+    buffer.seek(0)
+    with raises(ValidationContextMismatch):
+        BinaryErrorHandler(consider_context=True, document_id='bar').read(buffer)
+
+    with raises(TypeError):
+        Validator(sample_schema, error_handler=BinaryErrorHandler(StringIO()))(sample_document)
+
+
+def test_emit_and_iter_through_socket():
+    sender, receiver = socketpair()
+
+    validator = Validator(sample_schema, error_handler=BinaryErrorHandler(sender))
+    validator(sample_document)
+    sender.close()
+
+    received_errors = list(BinaryErrorHandler(receiver, chunk_size=3))
+    receiver.close()
+
+    assert received_errors == validator._errors
+    assert_equal_errors(validator._errors, received_errors)
+
+
+def test_validate_many():
+    documents = {'a': sample_document, 'b': {}, 'c': sample_document}
+    buffer = BytesIO()
+    assert validate_many(documents, sample_schema, workers=2, chunk_size=1,
+                         error_handler=(BinaryErrorHandler, {'buffer': buffer})) == ['a', 'c']
+
+    expected = []
+    for _ in documents:
+        validator = Validator(sample_schema)
+        validator(sample_document)
+        expected.extend(validator._errors)
+    buffer.seek(0)
+    handler = BinaryErrorHandler(buffer, consider_context=True)
+    assert_equal_errors(expected[:len(expected) * 2 // 3], list(handler))
+    buffer.seek(0)
+    with raises(ValidationContextMismatch):
+        list(BinaryErrorHandler(buffer, consider_context=True, document_id='a'))
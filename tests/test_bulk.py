@@ -0,0 +1,51 @@
+from io import BytesIO, StringIO
+import json
+
+from pytest import mark
+
+from cerberus_collections import JSONErrorHandler, Validator, XMLErrorHandler, validate_many
+
+from . import assert_equal_errors
+
+schema = {'name': {'type': 'string', 'maxlength': 8}, 'age': {'type': 'integer', 'min': 0}}
+documents = [{'name': 'x' * (i % 12), 'age': i % 7 - 3} for i in range(50)]
+
+
+def expected_errors():
+    validator = Validator(schema)
+    result = {}
+    for document_id, document in enumerate(documents):
+        if not validator(document):
+            result[document_id] = validator._errors
+    return result
+
+
+@mark.parametrize('executor', ('thread', 'process'))
+def test_validate_many_to_json(executor):
+    expected = expected_errors()
+    buffer = StringIO()
+    invalid_documents = validate_many(documents, schema, workers=3, executor=executor,
+                                      chunk_size=4,
+                                      error_handler=(JSONErrorHandler, {'buffer': buffer}))
+    assert invalid_documents == sorted(expected)
+
+    dump = json.loads(buffer.getvalue())
+    document_ids = [x['document_id'] for x in dump]
+    assert document_ids == sorted(document_ids)
+
+    for document_id, errors in expected.items():
+        handler = JSONErrorHandler(consider_context=True, document_id=document_id)
+        parsed_errors = handler.parse(json.dumps([x for x in dump
+                                                  if x['document_id'] == document_id]))
+        assert_equal_errors(errors, parsed_errors)
+
+
+def test_validate_many_to_xml():
+    expected = expected_errors()
+    buffer = BytesIO()
+    validate_many(dict(enumerate(documents)), schema, workers=2,
+                  error_handler=(XMLErrorHandler, {'buffer': buffer}))
+
+    buffer.seek(0)
+    parsed_errors = XMLErrorHandler().read(buffer)
+    assert_equal_errors([x for errors in expected.values() for x in errors], parsed_errors)
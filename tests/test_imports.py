@@ -0,0 +1,37 @@
+from os import path
+from subprocess import PIPE, run
+import sys
+
+from pytest import mark
+
+
+@mark.skipif(sys.version_info < (3, 7), reason='requires lazy module attributes')
+def test_xml_dependencies_are_not_imported_eagerly():
+    process = run([sys.executable, '-X', 'importtime', '-c', 'import cerberus_collections'],
+                  cwd=path.join(path.dirname(__file__), '..'), stderr=PIPE, check=True,
+                  universal_newlines=True)
+    imported = [x.rsplit('|', 1)[-1].strip() for x in process.stderr.splitlines()
+                if x.startswith('import time:')]
+    assert 'cerberus_collections' in imported
+    assert 'cerberus_collections.error_handlers.xml' not in imported
+    assert not [x for x in imported if x.split('.')[0] == 'lxml']
+
+
+def test_star_import():
+    namespace = {}
+    exec('from cerberus_collections import *', namespace)
+    for name in ('BinaryErrorHandler', 'JSONErrorHandler', 'Validator', 'VanillaValidator',
+                 'XMLErrorHandler', 'validate_many', 'validator_factory'):
+        assert name in namespace
+
+
+@mark.skipif(sys.version_info < (3, 7), reason='requires lazy module attributes')
+def test_process_pools_are_not_imported_eagerly():
+    process = run([sys.executable, '-X', 'importtime', '-c', 'import cerberus_collections'],
+                  cwd=path.join(path.dirname(__file__), '..'), stderr=PIPE, check=True,
+                  universal_newlines=True)
+    imported = [x.rsplit('|', 1)[-1].strip() for x in process.stderr.splitlines()
+                if x.startswith('import time:')]
+    assert 'cerberus_collections.bulk' not in imported
+    assert 'concurrent.futures.process' not in imported
+    assert 'multiprocessing' not in imported
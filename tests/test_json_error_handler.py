@@ -1,15 +1,21 @@
 from collections import Sequence, Mapping
 from copy import deepcopy
-from io import StringIO
+from io import BytesIO, StringIO
+import gzip
+import json
 from socket import socketpair
 import sys
 
-from pytest import raises
+from cerberus.errors import ValidationError
+from pytest import raises, warns
 
 from cerberus_collections import Validator, JSONErrorHandler
 from cerberus_collections.error_handlers.exceptions import ValidationContextMismatch
+from cerberus_collections.error_handlers.json import \
+    ErrorEncoder, JSONLinesScanner, JSONMappingScanner
+from cerberus_collections.utils import error_as_dict
 
-from . import assert_equal_errors, sample_document, sample_schema
+from . import assert_equal_errors, run_coroutine, sample_document, sample_schema
 
 
 def jsonify(obj):
@@ -53,6 +59,41 @@ def test_simple():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_error_encoder_matches_json_dumps():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    errors = validator._errors
+    signature = JSONErrorHandler(consider_context=True, document_id='foo')._validation_signature
+
+    for indent in (None, -1, 0, 2, '\t'):
+        for separators in (None, (',', ':'), (', ', ': ')):
+            encoder = ErrorEncoder(indent=indent, separators=separators, signature=signature)
+            expected = [dict(error_as_dict(x), **signature) for x in errors]
+            assert encoder.encode_list(errors) == \
+                json.dumps(expected, indent=indent, separators=separators)
+            assert encoder.encode(errors[0]) == \
+                json.dumps(expected[0], indent=indent, separators=separators)
+            assert ErrorEncoder(indent=indent, separators=separators).encode_list([]) == '[]'
+
+
+def test_error_encoder_backends():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    expected = json.loads(ErrorEncoder().encode_list(validator._errors))
+    for backend in ('orjson', 'ujson'):
+        encoder = ErrorEncoder(separators=(',', ':'), backend=backend)
+        assert json.loads(encoder.encode_list(validator._errors)) == expected
+
+    # values that not all backends can encode and non-ASCII characters
+    error = ValidationError(('a_dict',), ('a_dict', 'type'), 0x24, 'type', 'string',
+                            {1: ['äöü', '\U0001f600', 'x\u2028y'], 'big': 2 ** 70}, ())
+    expected = ErrorEncoder(separators=(',', ':')).encode(error)
+    for backend in ('orjson', 'ujson'):
+        assert ErrorEncoder(separators=(',', ':'), backend=backend).encode(error) == expected
+        handler = JSONErrorHandler(indent=None, backend=backend)
+        assert handler.parse(handler([error])) == [error]
+
+
 def test_read_errors_from_file():
     buffer, validator = write_errors_to_file('foo', 'bar')
     parsed_errors = read_errors_from_file(buffer, 'foo', 'bar')
@@ -62,6 +103,22 @@ def test_read_errors_from_file():
         read_errors_from_file(buffer, 'bar', 'foo')
 
 
+def test_signature_mismatches():
+    handler = JSONErrorHandler(document_id='foo', schema_id='bar', consider_context=True)
+    signature = handler._validation_signature
+    handler._validate_signature(signature)
+    handler._validate_signature({'document_id': None, 'schema_id': 'bar'})
+
+    with warns(UserWarning, match='different handler version'):
+        handler._validate_signature(dict(signature, handler_version='0.0'))
+    with warns(UserWarning, match='different validator'):
+        handler._validate_signature(dict(signature, validator='colander'))
+    with raises(ValidationContextMismatch):
+        handler._validate_signature(signature, document_id='baz')
+    with raises(ValidationContextMismatch):
+        handler._validate_signature(dict(signature, schema_id='baz'))
+
+
 def test_write_and_read_socket():
     sender, receiver = socketpair()
 
@@ -79,6 +136,23 @@ def test_write_and_read_socket():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_read_socket_in_small_chunks():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    dump = JSONErrorHandler()(validator._errors).encode()
+
+    for compression, data in ((None, dump), ('gzip', gzip.compress(dump))):
+        sender, receiver = socketpair()
+        sender.sendall(data)
+        sender.close()
+        handler = JSONErrorHandler(chunk_size=7, compression=compression)
+        assert handler.read(receiver) == validator._errors
+        receiver.close()
+
+    for data in (bytearray(dump), memoryview(dump), b' \n' + dump):
+        assert JSONErrorHandler().parse(data) == validator._errors
+
+
 def test_iter_errors_from_file():
     buffer, validator = write_errors_to_file(None, None)
     buffer.seek(0)
@@ -89,6 +163,33 @@ def test_iter_errors_from_file():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_mapping_scanner():
+    mappings = ['{"a":{"b":"}"}}', '{"c":"\\"{"}', '{"d":[{}, "\\\\"]}']
+    stream = '[' + ', '.join(mappings) + ']'
+    for chunk_size in range(1, len(stream) + 1):
+        for _type in (str, bytes):
+            data = stream if _type is str else stream.encode()
+            scanner = JSONMappingScanner()
+            result = []
+            for i in range(0, len(data), chunk_size):
+                result.extend(scanner.feed(data[i:i + chunk_size]))
+            assert [json.loads(x if _type is str else x.decode()) for x in result] == \
+                [json.loads(x) for x in mappings]
+
+
+def test_iter_errors_from_file_in_order():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    handler = JSONErrorHandler()
+    handler.extend(validator._errors)
+    dump = str(handler)
+
+    for buffer in (StringIO(dump), BytesIO(dump.encode())):
+        parsed_errors = list(JSONErrorHandler(buffer=buffer, chunk_size=7))
+        assert parsed_errors == validator._errors
+        assert_equal_errors(validator._errors, parsed_errors)
+
+
 def test_emit_and_iter_through_file():
     buffer = StringIO()
     validator = Validator(sample_schema, error_handler=(JSONErrorHandler,
@@ -117,3 +218,369 @@ def test_emit_and_iter_through_socket():
     receiver.close()
 
     assert_equal_errors(validator._errors, received_errors)
+
+
+def test_iter_through_socket_in_small_chunks():
+    sender, receiver = socketpair()
+
+    validator = Validator(sample_schema, error_handler=JSONErrorHandler(sender))
+    validator(sample_document)
+    sender.close()
+
+    received_errors = list(JSONErrorHandler(receiver, chunk_size=3))
+    receiver.close()
+
+    assert received_errors == validator._errors
+    assert_equal_errors(validator._errors, received_errors)
+
+
+class CountingBytesIO(BytesIO):
+    writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+class CountingStringIO(StringIO):
+    writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def test_coalesced_emission():
+    for buffer in (CountingBytesIO(), CountingStringIO()):
+        validator = Validator(sample_schema, error_handler=(JSONErrorHandler,
+                                                            {'buffer': buffer,
+                                                             'write_buffer_size': 2 ** 20}))
+        validator(sample_document)
+        assert buffer.writes == 1
+
+        buffer.seek(0)
+        parsed_errors = list(JSONErrorHandler(buffer=buffer))
+        assert_equal_errors(validator._errors, parsed_errors)
+
+
+def test_typed_values():
+    from datetime import date, datetime, timedelta, timezone
+
+    schema = {'binary': {'type': 'string'},
+              'a_set': {'type': 'list'},
+              'moment': {'type': 'date'},
+              'a_datetime': {'type': 'string'},
+              'a_dict': {'type': 'string'},
+              'a_tuple': {'type': 'string'},
+              'tricky': {'type': 'string'}}
+    document = {'binary': b'\x00\x01', 'a_set': {1, 2}, 'moment': datetime(2016, 9, 1, 12, 0),
+                'a_datetime': [datetime(2016, 9, 1, 12, 0, 1, 500),
+                               datetime(2016, 9, 1, tzinfo=timezone(timedelta(hours=-2)))],
+                'a_dict': {1: frozenset('a'), (2, 3): date(2016, 9, 1)},
+                'a_tuple': (1, (2, bytearray(b'x'))), 'tricky': {'__tuple__': (1,)}}
+    validator = Validator(schema)
+    validator(document)
+
+    for kwargs in ({}, {'indent': 2, 'compact': False}):
+        handler = JSONErrorHandler(typed_values=True, **kwargs)
+        dump = handler(validator._errors)
+        parsed_errors = handler.parse(dump)
+        assert_equal_errors(validator._errors, parsed_errors)
+        for error in parsed_errors:
+            assert type(error.value) is type(document[error.field])
+
+        buffer = StringIO(dump)
+        assert_equal_errors(validator._errors,
+                            list(JSONErrorHandler(buffer, typed_values=True, chunk_size=16)))
+
+
+def test_typed_values_of_subclasses():
+    from collections import OrderedDict, namedtuple
+
+    Point = namedtuple('Point', ('x', 'y'))
+    schema = {'a_dict': {'type': 'string'}, 'a_tuple': {'type': 'string'}}
+    document = {'a_dict': OrderedDict([(1, 2)]), 'a_tuple': Point(1, 2)}
+    validator = Validator(schema)
+    validator(document)
+
+    handler = JSONErrorHandler(typed_values=True)
+    values = {x.field: x.value for x in handler.parse(handler(validator._errors))}
+    assert values == {'a_dict': {1: 2}, 'a_tuple': (1, 2)}
+    assert type(values['a_tuple']) is tuple
+
+
+def test_emit_and_iter_through_asyncio_streams():
+    import asyncio
+    from cerberus_collections import AsyncJSONErrorHandler
+
+    async def validate_and_receive():
+        sender, receiver = socketpair()
+        _, writer = await asyncio.open_connection(sock=sender)
+        reader, _ = await asyncio.open_connection(sock=receiver)
+
+        handler = AsyncJSONErrorHandler(writer, write_buffer_size=64)
+        validator = Validator(sample_schema, error_handler=handler)
+        validator(sample_document)
+        await handler.drain()
+        writer.close()
+
+        received_errors = []
+        async for error in AsyncJSONErrorHandler(reader, chunk_size=16):
+            received_errors.append(error)
+        receiver.close()
+        return validator._errors, received_errors
+
+    errors, received_errors = run_coroutine(validate_and_receive())
+    assert received_errors == errors
+    assert_equal_errors(errors, received_errors)
+
+
+def test_session_of_aborted_validation_is_discarded():
+    import gc
+    from cerberus_collections.error_handlers.mixins import EmissionSession
+
+    buffer = StringIO()
+    JSONErrorHandler(buffer).start(None)
+    assert len(EmissionSession._registry) == 1
+    buffer_id = id(buffer)
+    del buffer
+    gc.collect()
+    assert not EmissionSession._registry
+
+    # a buffer that happens to get the same id must not join a stale session
+    buffers = []
+    for _ in range(10000):
+        buffer = StringIO()
+        if id(buffer) == buffer_id:
+            break
+        buffers.append(buffer)
+    validator = Validator(sample_schema, error_handler=(JSONErrorHandler, {'buffer': buffer}))
+    validator(sample_document)
+    assert buffer.getvalue().startswith('[')
+    assert buffer.getvalue().endswith(']')
+    buffer.seek(0)
+    assert_equal_errors(validator._errors, list(JSONErrorHandler(buffer)))
+
+
+def test_drain_stream_writer_subclass():
+    import asyncio
+    from cerberus_collections import AsyncJSONErrorHandler
+
+    class Writer(asyncio.StreamWriter):
+        pass
+
+    async def emit_and_drain():
+        sender, receiver = socketpair()
+        _, writer = await asyncio.open_connection(sock=sender)
+        writer.__class__ = Writer
+        handler = AsyncJSONErrorHandler(writer, write_buffer_size=2 ** 16)
+        validator = Validator(sample_schema)
+        validator(sample_document)
+        handler.start(None)
+        handler.emit(validator._errors[0])
+        await handler.drain()
+        pending = bytes(handler._session.write_buffer)
+        handler.end(None)
+        writer.close()
+        receiver.close()
+        return pending
+
+    assert run_coroutine(emit_and_drain()) == b''
+
+
+def test_concurrent_emission_to_one_buffer():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+    from cerberus_collections.error_handlers.mixins import EmissionSession
+
+    buffer = StringIO()
+    barrier = Barrier(4)
+
+    def validate(write_buffer_size):
+        validator = Validator(sample_schema, error_handler=(
+            JSONErrorHandler, {'buffer': buffer, 'write_buffer_size': write_buffer_size}))
+        barrier.wait()
+        validator(sample_document)
+        return validator._errors
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(validate, (0, 64, 0, 2 ** 16)))
+
+    assert not EmissionSession._registry
+    expected = [x for errors in results for x in errors]
+    for _json in json.loads('[' + buffer.getvalue().replace('][', '],[') + ']'):
+        assert isinstance(_json, list)
+    buffer.seek(0)
+    assert_equal_errors(expected, list(JSONErrorHandler(buffer)))
+
+
+def test_compressed_emission():
+    import gzip
+    from importlib.util import find_spec
+
+    for compression in ('gzip', 'lzma', 'zstd', 'lz4'):
+        if compression == 'zstd' and find_spec('zstandard') is None or \
+                compression == 'lz4' and find_spec('lz4') is None:
+            continue
+        buffer = BytesIO()
+        errors = []
+        for write_buffer_size in (0, 256):
+            validator = Validator(sample_schema, error_handler=(
+                JSONErrorHandler, {'buffer': buffer, 'compression': compression,
+                                   'write_buffer_size': write_buffer_size}))
+            validator(sample_document)
+            errors.extend(validator._errors)
+        if compression == 'gzip':
+            assert gzip.decompress(buffer.getvalue()).startswith(b'[{')
+
+        buffer.seek(0)
+        parsed_errors = list(JSONErrorHandler(buffer, compression=compression, chunk_size=16))
+        assert_equal_errors(errors, parsed_errors)
+
+    sender, receiver = socketpair()
+    validator = Validator(sample_schema, error_handler=JSONErrorHandler(sender,
+                                                                        compression='gzip'))
+    validator(sample_document)
+    sender.close()
+    assert_equal_errors(validator._errors,
+                        JSONErrorHandler(compression='gzip').read(receiver))
+    receiver.close()
+
+    with raises(TypeError):
+        Validator(sample_schema, error_handler=JSONErrorHandler(
+            StringIO(), compression='gzip'))(sample_document)
+    with raises(ValueError):
+        JSONErrorHandler(compression='zip')
+
+
+def test_json_lines():
+    buffer = BytesIO()
+    handler = JSONErrorHandler(buffer, format='jsonl', consider_context=True, document_id='foo')
+    validator = Validator(sample_schema, error_handler=handler)
+    validator(sample_document)
+    expected = validator._errors
+    validator(sample_document)
+    expected += validator._errors
+
+    lines = buffer.getvalue().decode().splitlines()
+    assert len(lines) == len(expected)
+    assert all(json.loads(x)['document_id'] == 'foo' for x in lines)
+
+    for chunk_size in (7, 2 ** 16):
+        buffer.seek(0)
+        reader = JSONErrorHandler(buffer, format='jsonl', consider_context=True,
+                                  document_id='foo', chunk_size=chunk_size)
+        assert list(reader) == expected
+
+    parsed_errors = reader.parse(buffer.getvalue().rstrip())
+    assert_equal_errors(expected, parsed_errors)
+    with raises(ValidationContextMismatch):
+        reader.parse(buffer.getvalue(), document_id='bar')
+    assert JSONErrorHandler(format='jsonl', compact=False, indent=2)(expected).count('\n') == \
+        len(expected)
+
+    # only line feeds separate records
+    error = ValidationError(('a_dict',), ('a_dict', 'type'), 0x24, 'type', 'string',
+                            {'k': 'x\u2028y\x85z\x0b'}, ())
+    dump = '\n'.join(json.dumps(error_as_dict(error), ensure_ascii=False) for _ in range(2))
+    handler = JSONErrorHandler(format='jsonl')
+    assert [x.value for x in handler.parse(dump)] == [error.value] * 2
+    assert [x.value for x in JSONErrorHandler(StringIO(dump), format='jsonl')] == \
+        [error.value] * 2
+    with raises(ValueError):
+        JSONErrorHandler(format='yaml')
+
+
+def test_json_lines_scanner():
+    lines = ['{"a":"\\n"}', '{"b":1}', '{"c":[]}']
+    stream = '\n'.join(lines) + '\n\n'
+    for chunk_size in range(1, len(stream) + 1):
+        scanner = JSONLinesScanner()
+        result = []
+        for i in range(0, len(stream), chunk_size):
+            result.extend(scanner.feed(stream[i:i + chunk_size]))
+        assert result + scanner.flush() == lines
+    scanner = JSONLinesScanner()
+    assert scanner.feed(b'{}\n{') == [b'{}']
+    assert scanner.flush() == [b'{']
+
+
+def test_envelope():
+    from cerberus_collections import validate_many
+
+    buffer = BytesIO()
+    handler = JSONErrorHandler(buffer, envelope=True, consider_context=True, document_id='foo')
+    validator = Validator(sample_schema, error_handler=handler)
+    validator(sample_document)
+    expected = validator._errors
+
+    envelopes = json.loads(buffer.getvalue().decode())
+    assert len(envelopes) == 1
+    assert envelopes[0]['signature']['document_id'] == 'foo'
+    assert all('document_id' not in x for x in envelopes[0]['errors'])
+
+    for chunk_size in (5, 2 ** 16):
+        buffer.seek(0)
+        reader = JSONErrorHandler(buffer, envelope=True, consider_context=True,
+                                  document_id='foo', chunk_size=chunk_size)
+        assert list(reader) == expected
+    assert reader.parse(buffer.getvalue()) == expected
+    assert reader.parse(reader(expected)) == expected
+    with raises(ValidationContextMismatch):
+        reader.parse(buffer.getvalue(), document_id='bar')
+    buffer.seek(0)
+    with raises(ValidationContextMismatch):
+        list(JSONErrorHandler(buffer, envelope=True, consider_context=True, document_id='bar'))
+
+    documents = {'a': sample_document, 'b': {}, 'c': {'fibonacci': 4}}
+    buffer = BytesIO()
+    validate_many(documents, sample_schema,
+                  error_handler=(JSONErrorHandler, {'buffer': buffer, 'envelope': True,
+                                                    'consider_context': True}))
+    envelopes = json.loads(buffer.getvalue().decode())
+    assert [x['signature']['document_id'] for x in envelopes] == ['a', 'c']
+    reader = JSONErrorHandler(envelope=True, consider_context=True)
+    errors = reader.parse(buffer.getvalue())
+    assert len(errors) == sum(len(x['errors']) for x in envelopes)
+
+    with raises(ValueError):
+        JSONErrorHandler(format='jsonl', envelope=True)
+
+
+def test_read_for_indexed_errors():
+    from cerberus_collections import validate_many
+
+    documents = {'a': sample_document, 'b': {}, 'c': {'fibonacci': 4}}
+    for _format in ('json', 'jsonl'):
+        buffer, index = BytesIO(), BytesIO()
+        handler_kwargs = {'buffer': buffer, 'index': index, 'format': _format}
+        validate_many(documents, sample_schema, error_handler=(JSONErrorHandler, handler_kwargs),
+                      workers=2, chunk_size=1)
+
+        handler = JSONErrorHandler(**handler_kwargs)
+        assert len(handler.read_for()) == len(handler.read(BytesIO(buffer.getvalue())))
+        assert handler.read_for(document_id='b') == []
+        errors = handler.read_for(document_id='c')
+        assert errors and {x.document_path for x in errors} == {('fibonacci',)}
+        assert len(handler.read_for(document_id='a', document_path=('fibonacci',))) == \
+            len([x for x in handler.read_for(document_id='a') if x.field == 'fibonacci'])
+        assert handler.read_for(document_id='a', document_path=('a_list', 0)) == []
+
+    with raises(TypeError):
+        Validator(sample_schema, error_handler=JSONErrorHandler(
+            StringIO(), index=BytesIO()))(sample_document)
+    with raises(ValueError):
+        Validator(sample_schema, error_handler=JSONErrorHandler(
+            BytesIO(), index=BytesIO(), compression='gzip'))(sample_document)
+
+
+def test_decoded_paths_are_shared():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    handler = JSONErrorHandler()
+    dump = handler(validator._errors + validator._errors)
+    errors = handler.parse(dump)
+    half = len(errors) // 2
+    for x, y in zip(errors[:half], errors[half:]):
+        assert x.document_path is y.document_path
+        assert x.schema_path is y.schema_path
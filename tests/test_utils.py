@@ -1,4 +1,9 @@
-from cerberus_collections.utils import binary_to_base64, base64_to_bytes
+from datetime import date, datetime, timedelta, timezone
+
+from pytest import raises
+
+from cerberus_collections.utils import \
+    PathCache, binary_to_base64, base64_to_bytes, date_from_isoformat, datetime_from_isoformat
 
 
 def test_binary_encoding():
@@ -6,3 +11,35 @@ def test_binary_encoding():
     y = bytearray(x)
     assert binary_to_base64(x) == binary_to_base64(y)
     assert x == base64_to_bytes(binary_to_base64(y))
+
+
+def test_isoformat_parsing():
+    assert date_from_isoformat(date(2016, 9, 1).isoformat()) == date(2016, 9, 1)
+    for value in (datetime(2016, 9, 1, 12, 0), datetime(2016, 9, 1, 12, 0, 1, 500),
+                  datetime(2016, 9, 1, tzinfo=timezone.utc),
+                  datetime(2016, 9, 1, 23, 59, 59, 999999,
+                           tzinfo=timezone(timedelta(hours=-5, minutes=-30)))):
+        parsed = datetime_from_isoformat(value.isoformat())
+        assert parsed == value
+        assert parsed.utcoffset() == value.utcoffset()
+    for value in ('2016-09-01T12:00', '2016-9-1', 'x'):
+        with raises(ValueError):
+            datetime_from_isoformat(value)
+    with raises(ValueError):
+        date_from_isoformat('2016-09-01T12:00:00')
+
+
+def test_path_cache():
+    paths = PathCache(maxsize=3)
+    a = paths(['a_dict', 'schema'])
+    assert a == ('a_dict', 'schema')
+    assert paths(['a_dict', 'schema']) is a
+    assert paths(['a_dict', 'valuesrules'])[0] is a[0]
+
+    one = paths(['a_list', 1])
+    assert paths(('a_list', 1)) is one
+    assert type(paths(['a_list', True])[1]) is bool
+    assert type(paths(['a_list', 1.0])[1]) is float
+
+    paths(['c'])
+    assert len(paths.paths) == 1
@@ -1,17 +1,23 @@
+from collections import OrderedDict
+from fractions import Fraction
+import gzip
 from io import BytesIO
+from mmap import ACCESS_READ, mmap
 from socket import socketpair
 import sys
+from tempfile import NamedTemporaryFile
 
 from cerberus.errors import ValidationError
 from lxml.etree import _Element, tostring
-from pytest import raises
+from pytest import raises, warns
 
 from cerberus_collections import Validator, XMLErrorHandler
 from cerberus_collections.error_handlers.exceptions import ValidationContextMismatch
 from cerberus_collections.error_handlers.xml import \
-    Encoder, Decoder, DecodingError, element_from_error
+    Encoder, Decoder, DecodingError, ElementCache, ErrorStreamParser, element_from_error, \
+    iter_error_elements
 
-from . import assert_equal_errors, sample_document, sample_schema
+from . import assert_equal_errors, run_coroutine, sample_document, sample_schema
 
 
 def test_encoder_decoder():
@@ -28,6 +34,31 @@ def test_encoder_decoder():
     assert Decoder.decode(x) == some_bytes
 
 
+def test_encoder_dispatch():
+    x = Encoder.encode('a_mapping', OrderedDict((('a', 1), ('b', 2))))
+    assert x.attrib['type'] == 'dict'
+    assert Decoder.decode(x) == {'a': 1, 'b': 2}
+
+    x = Encoder.encode('a_bool', False)
+    assert x.attrib['type'] == 'bool'
+    assert Decoder.decode(x) is False
+
+    class FractionEncoder(Encoder):
+        pass
+
+    class FractionDecoder(Decoder):
+        pass
+
+    FractionEncoder.register(Fraction, lambda x: '{}/{}'.format(x.numerator, x.denominator))
+    FractionDecoder.register(Fraction, lambda x: Fraction(x.text))
+    x = FractionEncoder.encode('a_fraction', Fraction(1, 3))
+    assert x.text == '1/3'
+    assert FractionDecoder.decode(x) == Fraction(1, 3)
+    assert Encoder.encode('a_fraction', Fraction(1, 3)).text == str(Fraction(1, 3))
+    with raises(NotImplementedError):
+        Decoder.decode(x)
+
+
 def test_decoding_error():
     x = Encoder.encode('a_bool', True)
     x.text = 'cat_in_a_box'
@@ -104,6 +135,22 @@ def test_write_and_read_socket():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_read_socket_in_small_chunks():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    handler = XMLErrorHandler()
+    handler.extend(validator._errors)
+    dump = str(handler).encode()
+
+    for compression, data in ((None, dump), ('gzip', gzip.compress(dump))):
+        sender, receiver = socketpair()
+        sender.sendall(data)
+        sender.close()
+        handler = XMLErrorHandler(chunk_size=7, compression=compression)
+        assert handler.read(receiver) == validator._errors
+        receiver.close()
+
+
 def test_iter_errors_from_file():
     buffer, validator = write_errors_to_file(None, None)
     buffer.seek(0)
@@ -114,6 +161,35 @@ def test_iter_errors_from_file():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_iter_error_elements_releases_memory():
+    buffer, validator = write_errors_to_file(None, None)
+    buffer.seek(0)
+    elements = iter_error_elements(buffer)
+    assert next(elements).tag == 'errors'
+    parsed_errors = []
+    for element in elements:
+        parsed_errors.append(XMLErrorHandler().parse(element))
+        assert element.getprevious() is None
+    assert element.getparent() is None
+    assert_equal_errors(validator._errors, parsed_errors)
+
+
+def test_read_errors_from_path_and_mmap():
+    buffer, _ = write_errors_to_file('foo', 'bar')
+    with NamedTemporaryFile(suffix='.xml') as f:
+        f.write(buffer.getvalue())
+        f.flush()
+        handler = XMLErrorHandler(document_id='foo', schema_id='bar', consider_context=True)
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as mapped:
+            for source in (f.name, mapped):
+                validator = Validator(sample_schema)
+                validator(sample_document)
+                assert_equal_errors(validator._errors, handler.read(source))
+        assert len(list(handler.iterread(f.name))) == len(validator._errors)
+        with raises(ValidationContextMismatch):
+            handler.read(f.name, document_id='bar')
+
+
 def test_emit_and_iter_through_file():
     buffer = BytesIO()
     validator = Validator(sample_schema, error_handler=(XMLErrorHandler,
@@ -126,6 +202,177 @@ def test_emit_and_iter_through_file():
     assert_equal_errors(validator._errors, parsed_errors)
 
 
+def test_coalesced_emission():
+    class CountingBytesIO(BytesIO):
+        writes = 0
+
+        def write(self, data):
+            self.writes += 1
+            return super().write(data)
+
+    buffer = CountingBytesIO()
+    validator = Validator(sample_schema, error_handler=(XMLErrorHandler,
+                                                        {'buffer': buffer,
+                                                         'write_buffer_size': 2 ** 20}))
+    validator(sample_document)
+    assert buffer.writes == 1
+
+    buffer.seek(0)
+    parsed_errors = [x for x in XMLErrorHandler(buffer=buffer)]
+    assert_equal_errors(validator._errors, parsed_errors)
+
+
+def test_incremental_emission():
+    document_id = '"<foo>" & bar'
+    buffer, expected = BytesIO(), BytesIO()
+    for target, incremental in ((buffer, True), (expected, False)):
+        validator = Validator(sample_schema, error_handler=XMLErrorHandler(
+            target, incremental=incremental, consider_context=True, document_id=document_id))
+        validator(sample_document)
+
+    buffer.seek(0)
+    parsed_errors = list(XMLErrorHandler(buffer, chunk_size=16, consider_context=True,
+                                         document_id=document_id))
+    expected.seek(0)
+    assert parsed_errors == list(XMLErrorHandler(expected)) == validator._errors
+    buffer.seek(0)
+    with raises(ValidationContextMismatch):
+        XMLErrorHandler(consider_context=True, document_id='baz').read(buffer)
+
+    buffer = BytesIO()
+    handlers = [XMLErrorHandler(buffer, incremental=True) for _ in range(2)]
+    for handler in handlers:
+        handler.start(None)
+    for error in validator._errors:
+        for handler in handlers:
+            handler.emit(error)
+    for handler in handlers:
+        handler.end(None)
+    assert buffer.getvalue().count(b'<errors>') == 1
+    buffer.seek(0)
+    assert list(XMLErrorHandler(buffer)) == [x for x in validator._errors for _ in handlers]
+
+    with NamedTemporaryFile(suffix='.xml') as f, NamedTemporaryFile(suffix='.idx') as index:
+        validator = Validator(sample_schema, error_handler=XMLErrorHandler(
+            f.file, index=index.name, incremental=True))
+        validator(sample_document)
+        f.flush()
+        errors = XMLErrorHandler(f.file, index=index.name).read_for()
+        assert errors == validator._errors
+
+    sender, receiver = socketpair()
+    validator = Validator(sample_schema, error_handler=XMLErrorHandler(sender, incremental=True))
+    validator(sample_document)
+    sender.close()
+    assert list(XMLErrorHandler(receiver, chunk_size=5)) == validator._errors
+    receiver.close()
+
+
+def test_element_cache():
+    cache = ElementCache(maxsize=2)
+    error = ValidationError(('a',), ('a', 'allowed'), 0x44, 'allowed', [1, 2], 3, (3,))
+    element = cache.encode(Encoder(), error, 'constraint', error.constraint)
+    assert cache.encode(Encoder(), error, 'constraint', [1, 2]) is element
+    assert cache.encode(Encoder(), error, 'constraint', [1, 3]) is not element
+    path = cache.encode(Encoder(), error, 'document_path', (1,))
+    assert cache.encode(Encoder(), error, 'document_path', (True,)) is not path
+    assert len(cache.elements) <= 2
+
+    # equal constraints with items of other types
+    handler = XMLErrorHandler(encoding_cache_size=64)
+    for allowed in ([1, 2], [1.0, 2.0], [True, 2], {1: [2]}, {1.0: [2]}, {1: [2.0]},
+                    {1, 2}, {1.0, 2}):
+        validator = Validator({'a': {'allowed': allowed}})
+        validator({'a': 3})
+        constraint = handler.parse(handler(validator._errors))[0].constraint
+        assert constraint == allowed
+        assert repr(constraint) == repr(allowed)
+
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    errors = validator._errors + validator._errors
+    for incremental in (False, True):
+        dumps = []
+        for size in (0, 16):
+            buffer = BytesIO()
+            handler = XMLErrorHandler(buffer, incremental=incremental, encoding_cache_size=size)
+            handler.start(None)
+            for error in errors:
+                handler.emit(error)
+            handler.end(None)
+            dumps.append(buffer.getvalue())
+        assert dumps[0] == dumps[1]
+    handler = XMLErrorHandler(encoding_cache_size=16)
+    assert tostring(handler(errors)) == tostring(XMLErrorHandler()(errors))
+
+
+def test_compressed_emission():
+    buffer = BytesIO()
+    validator = Validator(sample_schema, error_handler=(XMLErrorHandler,
+                                                        {'buffer': buffer,
+                                                         'compression': 'lzma'}))
+    validator(sample_document)
+
+    buffer.seek(0)
+    parsed_errors = list(XMLErrorHandler(buffer=buffer, compression='lzma', chunk_size=64))
+    assert_equal_errors(validator._errors, parsed_errors)
+
+    with NamedTemporaryFile(suffix='.xml.xz') as f:
+        f.write(buffer.getvalue())
+        f.flush()
+        assert len(XMLErrorHandler(compression='lzma').read(f.name)) == len(validator._errors)
+
+    sender, receiver = socketpair()
+    validator = Validator(sample_schema, error_handler=XMLErrorHandler(sender,
+                                                                       compression='gzip'))
+    validator(sample_document)
+    sender.close()
+    received_errors = list(XMLErrorHandler(receiver, compression='gzip', chunk_size=32))
+    receiver.close()
+    assert_equal_errors(validator._errors, received_errors)
+
+
+def test_read_for_indexed_errors():
+    with NamedTemporaryFile(suffix='.xml') as f, NamedTemporaryFile(suffix='.idx') as index:
+        f = f.file
+        for document_id in ('foo', 'bar'):
+            validator = Validator(sample_schema, error_handler=XMLErrorHandler(
+                f, document_id=document_id, consider_context=True, index=index.name))
+            validator(sample_document)
+        f.flush()
+
+        handler = XMLErrorHandler(f, index=index.name, consider_context=True)
+        assert len(handler.read_for(document_id='bar')) == len(validator._errors)
+        errors = handler.read_for(document_id='foo', document_path=('a_list',))
+        assert errors and all(x.document_path[0] == 'a_list' for x in errors)
+        with raises(ValidationContextMismatch):
+            XMLErrorHandler(f, index=index.name, consider_context=True, document_id='foo') \
+                .read_for(document_id='bar')
+
+
+def test_decoded_paths_are_shared():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    handler = XMLErrorHandler()
+    errors = handler.parse(tostring(handler(validator._errors + validator._errors)))
+    half = len(errors) // 2
+    for x, y in zip(errors[:half], errors[half:]):
+        assert x.document_path is y.document_path
+        assert x.schema_path is y.schema_path
+
+
+def test_parse_in_parallel():
+    buffer, validator = write_errors_to_file('foo', 'bar')
+    handler = XMLErrorHandler(document_id='foo', schema_id='bar', consider_context=True)
+    handler.parallel_chunk_size = 2
+    assert handler.parse(buffer.getvalue(), workers=2) == validator._errors
+    buffer.seek(0)
+    assert handler.read(buffer, workers=2) == validator._errors
+    buffer.seek(0)
+    with raises(ValidationContextMismatch):
+        handler.read(buffer, workers=2, document_id='bar')
+
+
 def test_emit_and_iter_through_socket():
     sender, receiver = socketpair()
 
@@ -138,3 +385,65 @@ def test_emit_and_iter_through_socket():
     receiver.close()
 
     assert_equal_errors(validator._errors, received_errors)
+
+
+def test_emit_and_iter_through_asyncio_streams():
+    import asyncio
+    from cerberus_collections import AsyncXMLErrorHandler
+
+    async def validate_and_receive():
+        sender, receiver = socketpair()
+        _, writer = await asyncio.open_connection(sock=sender)
+        reader, _ = await asyncio.open_connection(sock=receiver)
+
+        handler = AsyncXMLErrorHandler(writer, consider_context=True, document_id='foo')
+        validator = Validator(sample_schema, error_handler=handler)
+        validator(sample_document)
+        await handler.drain()
+        writer.close()
+
+        received_errors = []
+        async for error in AsyncXMLErrorHandler(reader, chunk_size=16, consider_context=True,
+                                                document_id='foo'):
+            received_errors.append(error)
+        receiver.close()
+        return validator._errors, received_errors
+
+    errors, received_errors = run_coroutine(validate_and_receive())
+    assert_equal_errors(errors, received_errors)
+
+
+def test_stream_parser():
+    validator = Validator(sample_schema)
+    validator(sample_document)
+    handler = XMLErrorHandler()
+    handler.extend(validator._errors)
+    stream = str(handler).encode()
+    assert b'&lt;/error&gt;' in stream
+
+    parser = ErrorStreamParser()
+    elements = []
+    for i in range(0, len(stream), 7):
+        for element in parser.feed(stream[i:i + 7]):
+            if element.tag == 'error':
+                elements.append(XMLErrorHandler().parse(element))
+                assert element.getprevious() is None
+    assert_equal_errors(validator._errors, elements)
+
+    parser = ErrorStreamParser()
+    with warns(UserWarning, match='<errors> element is missing'):
+        elements = parser.feed(b''.join(handler._as_string(x) for x in handler.root))
+    assert [x.tag for x in elements] == ['errors'] + ['error'] * len(validator._errors)
+
+
+def test_iter_through_socket_in_small_chunks():
+    sender, receiver = socketpair()
+
+    validator = Validator(sample_schema, error_handler=XMLErrorHandler(sender))
+    validator(sample_document)
+    sender.close()
+
+    received_errors = list(XMLErrorHandler(receiver, chunk_size=5))
+    receiver.close()
+
+    assert_equal_errors(validator._errors, received_errors)